@@ -1,8 +1,50 @@
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from scipy.sparse import diags
-from scipy.sparse.linalg import factorized
+from scipy.linalg import get_lapack_funcs
 
-def adi_heat_simulation(matrix, num_iterations, dt, dx=1, dy=1, sigma=1):
+def fatorar_matriz_tridiagonal(A):
+    """
+    Fatora a matriz tridiagonal simétrica como L*D*L^T (LAPACK ?pttrf).
+    
+    :param A: Matriz tridiagonal esparsa.
+    :return: Tupla (d, e) com os fatores.
+    """
+    pttrf, = get_lapack_funcs(('pttrf',), dtype=np.float64)
+    d, e, info = pttrf(A.diagonal(), A.diagonal(1))
+    if info != 0:
+        raise np.linalg.LinAlgError(f"Falha na fatoração tridiagonal (info={info})")
+    return d, e
+
+def resolver_em_lote(fatores, B, pool=None, num_blocos=1):
+    """
+    Resolve o sistema tridiagonal fatorado para todas as colunas de B de uma vez.
+    
+    :param fatores: Fatores (d, e) retornados por fatorar_matriz_tridiagonal.
+    :param B: Lados direitos empilhados como colunas, formato (n, num_linhas).
+    :param pool: ThreadPoolExecutor opcional; as colunas são divididas em blocos
+                 resolvidos em paralelo (a rotina do LAPACK libera o GIL).
+    :param num_blocos: Em quantos blocos dividir as colunas quando há pool.
+    :return: Soluções com o mesmo formato de B.
+    """
+    pttrs, = get_lapack_funcs(('pttrs',), (B,))
+    d, e = fatores
+    if pool is None or num_blocos <= 1:
+        X, info = pttrs(d, e, B)
+        if info != 0:
+            raise np.linalg.LinAlgError(f"Falha na solução tridiagonal (info={info})")
+        return X
+
+    # Cada coluna é independente: os blocos são resolvidos no próprio X (ordem Fortran)
+    X = np.array(B, dtype=np.float64, order='F')
+    limites = np.linspace(0, X.shape[1], num_blocos + 1).astype(int)
+    infos = list(pool.map(lambda a, b: pttrs(d, e, X[:, a:b], overwrite_b=True)[1],
+                          limites[:-1], limites[1:]))
+    if any(infos):
+        raise np.linalg.LinAlgError(f"Falha na solução tridiagonal (info={max(infos, key=abs)})")
+    return X
+
+def adi_heat_simulation(matrix, num_iterations, dt, dx=1, dy=1, sigma=1, num_threads=1):
     """
     Simula a propagação de calor usando o método ADI.
     
@@ -12,6 +54,8 @@ def adi_heat_simulation(matrix, num_iterations, dt, dx=1, dy=1, sigma=1):
     :param dx: Resolução espacial no eixo x.
     :param dy: Resolução espacial no eixo y.
     :param sigma: Coeficiente de difusão térmica.
+    :param num_threads: Quantas threads dividem as soluções de cada varredura
+                        (1 executa tudo na thread atual; o resultado é o mesmo).
     :return: Matriz 2D de temperatura final.
     """
     # Certificar que a matriz está normalizada
@@ -38,18 +82,23 @@ def adi_heat_simulation(matrix, num_iterations, dt, dx=1, dy=1, sigma=1):
 
 
     # Pré-fatoração das matrizes para resolver rapidamente os sistemas lineares
-    solver_x = factorized(A_x)
-    solver_y = factorized(A_y)
+    fatores_x = fatorar_matriz_tridiagonal(A_x)
+    fatores_y = fatorar_matriz_tridiagonal(A_y)
 
     # Copiar a matriz inicial para a simulação
     U = matrix.copy()
 
-    # Iterações no tempo
-    for _ in range(num_iterations):
-        # Resolver ao longo do eixo x (linhas)
-        U = np.apply_along_axis(solver_x, axis=1, arr=U)
+    pool = ThreadPoolExecutor(max_workers=num_threads) if num_threads > 1 else None
+    try:
+        # Iterações no tempo
+        for _ in range(num_iterations):
+            # Resolver ao longo do eixo x (todas as linhas de uma vez)
+            U = resolver_em_lote(fatores_x, U.T, pool, num_threads).T
 
-        # Resolver ao longo do eixo y (colunas)
-        U = np.apply_along_axis(solver_y, axis=0, arr=U)
+            # Resolver ao longo do eixo y (todas as colunas de uma vez)
+            U = resolver_em_lote(fatores_y, U, pool, num_threads)
+    finally:
+        if pool is not None:
+            pool.shutdown()
 
     return U
@@ -0,0 +1,290 @@
+"""
+Benchmark of every heat engine in this package on the same diffusion problem.
+
+For each engine, frame size, iteration count and time step it records wall
+time, peak RSS and the error against a time-exact reference solution of the
+discrete problem that engine solves (see ENGINE_BOUNDARIES).
+Each case runs in a fresh process so peak RSS belongs to that case only.
+
+Usage (from the repository root):
+    python -m convolucao.benchmark --sizes 128 256 --iterations 10 100 --dts 0.1 0.2 \\
+        --output benchmark.json
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import platform
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import scipy
+from scipy.fft import dctn, idctn, dstn, idstn, fft2, ifft2
+
+from .core import calculate_diffusion_coefficients
+from .finite_diff_simulation import FiniteDiffHeatSimulation
+from .fft_simulation import FFTHeatSimulation
+from .dct_simulation import DCTHeatSimulation
+from .adi_heat_simulation import ADIHeatSimulation
+from .adi_simulation import adi_heat_simulation
+from .conv_simulation import conv_simulation
+from .conv_FFT_simulation import conv_simulation_fft
+from .metodo_implicito import metodo_implicito
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; peak RSS is then not reported
+    resource = None
+
+def _run_metodo_implicito(matrix, num_iterations, dt, dx, dy, alpha):
+    ny, nx = matrix.shape
+    # Half a step of slack so int(Tf / dt) gives exactly num_iterations
+    return metodo_implicito(matrix, alpha, dt, (num_iterations + 0.5) * dt, dx * (nx - 1), dy * (ny - 1))
+
+def _run_adi(matrix, num_iterations, dt, dx, dy, alpha):
+    with ADIHeatSimulation(dt, dx, dy, alpha) as simulation:
+        return simulation.simulate(matrix, num_iterations)
+
+# Every engine takes (matrix, num_iterations, dt, dx, dy, alpha)
+ENGINES: Dict[str, Callable[..., np.ndarray]] = {
+    'finite_diff': lambda m, n, dt, dx, dy, alpha: FiniteDiffHeatSimulation(dt, dx, dy, alpha).simulate(m, n),
+    'fft': lambda m, n, dt, dx, dy, alpha: FFTHeatSimulation(dt, dx, dy, alpha).simulate(m, n),
+    'dct': lambda m, n, dt, dx, dy, alpha: DCTHeatSimulation(dt, dx, dy, alpha).simulate(m, n),
+    'adi': _run_adi,
+    'adi_heat_simulation': lambda m, n, dt, dx, dy, alpha: adi_heat_simulation(m, n, dt, dx, dy, sigma=alpha),
+    'conv_simulation': lambda m, n, dt, dx, dy, alpha: conv_simulation(m, n, dt, dx, dy, alpha),
+    'conv_simulation_fft': lambda m, n, dt, dx, dy, alpha: conv_simulation_fft(m, n, dt, dx, dy, alpha),
+    'metodo_implicito': _run_metodo_implicito,
+}
+
+# Boundary model each engine converges to as dt -> 0:
+#   'neumann'          zero flux through mirrored ghost cells (DCT-II eigenbasis)
+#   'zero'             zero temperature just outside the frame (DST-I eigenbasis)
+#   'periodic'         the frame wraps around (FFT eigenbasis)
+#   'padded_periodic'  periodic on the frame edge-padded to the next power of two
+#   'copy'             edge cells copy their inner neighbour, i.e. Neumann on the
+#                      interior with the edges filled in
+ENGINE_BOUNDARIES: Dict[str, str] = {
+    'finite_diff': 'copy',
+    'fft': 'padded_periodic',
+    'dct': 'neumann',
+    'adi': 'copy',
+    'adi_heat_simulation': 'zero',
+    'conv_simulation': 'zero',
+    'conv_simulation_fft': 'periodic',
+    'metodo_implicito': 'zero',
+}
+BOUNDARIES = ('neumann', 'zero', 'periodic', 'padded_periodic', 'copy')
+
+def make_input(size: int, seed: int = 0) -> np.ndarray:
+    """Deterministic test frame in [0, 1]: a smooth hot spot plus noise."""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:size, 0:size] / max(size - 1, 1)
+    blob = np.exp(-((x - 0.4)**2 + (y - 0.6)**2) / 0.02)
+    return np.clip(0.7 * blob + 0.3 * rng.random((size, size)), 0, 1)
+
+def _laplacian_eigenvalues(n: int, sigma: float, boundary: str) -> np.ndarray:
+    """Eigenvalues of the 1D stencil sigma * [1, -2, 1] in the eigenbasis of `boundary`."""
+    k = np.arange(n)
+    if boundary == 'neumann':
+        angles = np.pi * k / n
+    elif boundary == 'zero':
+        angles = np.pi * (k + 1) / (n + 1)
+    else:
+        angles = 2 * np.pi * k / n
+    return -2 * sigma * (1 - np.cos(angles))
+
+def reference_solution(matrix: np.ndarray, num_iterations: int, dt: float,
+                       dx: float = 1.0, dy: float = 1.0, alpha: float = 1.0,
+                       boundary: str = 'neumann') -> np.ndarray:
+    """
+    Time-exact solution of the spatially discrete heat equation at
+    t = num_iterations * dt, computed in the eigenbasis of the boundary model
+    (one of BOUNDARIES). The only error left is the time discretization of the
+    engine being measured.
+    """
+    if boundary not in BOUNDARIES:
+        raise ValueError(f"Unknown boundary '{boundary}'. Choose one of {BOUNDARIES}")
+    ny, nx = matrix.shape
+    if boundary == 'copy':
+        if min(ny, nx) < 3:
+            return matrix.copy()
+        interior = reference_solution(matrix[1:-1, 1:-1], num_iterations, dt, dx, dy, alpha, 'neumann')
+        return np.pad(interior, 1, mode='edge')
+    if boundary == 'padded_periodic':
+        # Same layout as FFTHeatSimulation._pad_matrix
+        padded_shape = [1 << (n - 1).bit_length() for n in (ny, nx)]
+        offsets = [p // 2 - n // 2 for p, n in zip(padded_shape, (ny, nx))]
+        padded = np.pad(matrix, [(o, p - n - o) for p, n, o in zip(padded_shape, (ny, nx), offsets)],
+                        mode='edge')
+        result = reference_solution(padded, num_iterations, dt, dx, dy, alpha, 'periodic')
+        return result[offsets[0]:offsets[0] + ny, offsets[1]:offsets[1] + nx]
+    
+    sigma_x, sigma_y = calculate_diffusion_coefficients(dt, dx, dy, alpha)
+    eigenvalues = (_laplacian_eigenvalues(ny, sigma_y, boundary)[:, None]
+                   + _laplacian_eigenvalues(nx, sigma_x, boundary)[None, :])
+    if boundary == 'neumann':
+        coefficients = dctn(matrix, type=2, norm='ortho')
+        return idctn(coefficients * np.exp(num_iterations * eigenvalues), type=2, norm='ortho')
+    if boundary == 'zero':
+        coefficients = dstn(matrix, type=1, norm='ortho')
+        return idstn(coefficients * np.exp(num_iterations * eigenvalues), type=1, norm='ortho')
+    return np.real(ifft2(fft2(matrix) * np.exp(num_iterations * eigenvalues)))
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+def _run_case(engine: str, size: int, num_iterations: int, dt: float,
+              dx: float, dy: float, alpha: float, repeats: int, seed: int) -> Dict:
+    """Run one benchmark case; meant to execute in a fresh worker process."""
+    record = {
+        'engine': engine, 'size': size, 'iterations': num_iterations, 'dt': dt,
+        'dx': dx, 'dy': dy, 'alpha': alpha, 'boundary': ENGINE_BOUNDARIES[engine], 'status': 'ok',
+        'time_min_s': None, 'time_median_s': None,
+        'peak_rss_mb': None, 'rss_increase_mb': None,
+        'max_error': None, 'rms_error': None,
+    }
+    matrix = make_input(size, seed)
+    rss_before = _peak_rss_mb()
+    
+    times = []
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = ENGINES[engine](matrix, num_iterations, dt, dx, dy, alpha)
+            times.append(time.perf_counter() - start)
+    except (ValueError, AssertionError) as e:
+        # Explicit engines refuse unstable parameters
+        record['status'] = f'skipped: {e}'
+        return record
+    
+    rss_after = _peak_rss_mb()
+    error = np.asarray(result) - reference_solution(matrix, num_iterations, dt, dx, dy, alpha,
+                                                    ENGINE_BOUNDARIES[engine])
+    record.update(
+        time_min_s=min(times),
+        time_median_s=float(np.median(times)),
+        peak_rss_mb=rss_after,
+        rss_increase_mb=None if rss_after is None else rss_after - rss_before,
+        max_error=float(np.max(np.abs(error))),
+        rms_error=float(np.sqrt(np.mean(error**2))),
+    )
+    return record
+
+def run_benchmark(engines: Sequence[str] = tuple(ENGINES), sizes: Sequence[int] = (64, 128, 256),
+                  iterations: Sequence[int] = (10, 100), dts: Sequence[float] = (0.1, 0.2),
+                  dx: float = 1.0, dy: float = 1.0, alpha: float = 1.0,
+                  repeats: int = 3, seed: int = 0, verbose: bool = True) -> List[Dict]:
+    """
+    Run every combination of engine, size, iteration count and time step.
+    
+    Args:
+        engines: Names of the engines to run (keys of ENGINES)
+        sizes: Side lengths of the square test frames
+        iterations: Iteration counts
+        dts: Time steps
+        dx: Spatial step in x direction
+        dy: Spatial step in y direction
+        alpha: Thermal diffusivity coefficient
+        repeats: Timed runs per case (min and median are reported)
+        seed: Seed of the test frame
+        verbose: Print one line per case
+        
+    Returns:
+        One record (dict) per case
+    """
+    unknown = set(engines) - set(ENGINES)
+    if unknown:
+        raise ValueError(f"Unknown engines: {sorted(unknown)}. Choose from {sorted(ENGINES)}")
+    
+    records = []
+    context = multiprocessing.get_context()
+    for size in sizes:
+        for num_iterations in iterations:
+            for dt in dts:
+                for engine in engines:
+                    # A fresh process per case keeps peak RSS measurements independent
+                    with context.Pool(1, maxtasksperchild=1) as pool:
+                        record = pool.apply(_run_case, (engine, size, num_iterations, dt,
+                                                        dx, dy, alpha, repeats, seed))
+                    records.append(record)
+                    if verbose:
+                        if record['status'] == 'ok':
+                            print(f"{engine:>20} size={size:<5} it={num_iterations:<5} dt={dt:<6} "
+                                  f"time={record['time_min_s']:.4f}s rms_err={record['rms_error']:.2e} "
+                                  f"({record['boundary']})")
+                        else:
+                            print(f"{engine:>20} size={size:<5} it={num_iterations:<5} dt={dt:<6} "
+                                  f"{record['status']}")
+    return records
+
+def environment_info() -> Dict[str, str]:
+    """Versions and machine details stored next to the results."""
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+def write_results(records: List[Dict], path: str) -> None:
+    """Save records as JSON (with environment info) or CSV, chosen by the file extension."""
+    if path.endswith('.csv'):
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(records[0]) if records else [])
+            writer.writeheader()
+            writer.writerows(records)
+    else:
+        with open(path, 'w') as f:
+            json.dump({'environment': environment_info(), 'results': records}, f, indent=2)
+
+def load_results(path: str) -> List[Dict]:
+    """Load records written by write_results (JSON or CSV)."""
+    if path.endswith('.csv'):
+        with open(path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        for row in rows:
+            for key, value in row.items():
+                if key in ('size', 'iterations'):
+                    row[key] = int(value)
+                elif key not in ('engine', 'boundary', 'status'):
+                    row[key] = float(value) if value not in ('', 'None') else None
+        return rows
+    with open(path) as f:
+        return json.load(f)['results']
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the heat simulation engines')
+    parser.add_argument('--engines', nargs='+', default=list(ENGINES), choices=list(ENGINES),
+                        help='Engines to benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[64, 128, 256],
+                        help='Side lengths of the square test frames')
+    parser.add_argument('--iterations', type=int, nargs='+', default=[10, 100],
+                        help='Iteration counts')
+    parser.add_argument('--dts', type=float, nargs='+', default=[0.1, 0.2],
+                        help='Time steps')
+    parser.add_argument('--repeats', type=int, default=3, help='Timed runs per case')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the test frame')
+    parser.add_argument('--output', type=str, nargs='+', default=['benchmark.json'],
+                        help='Result files (.json and/or .csv)')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    records = run_benchmark(args.engines, args.sizes, args.iterations, args.dts,
+                            repeats=args.repeats, seed=args.seed)
+    for path in args.output:
+        write_results(records, path)
+        print(f'Results saved to {path}')
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,7 @@ from pathlib import Path
 from scipy.linalg import svd, solve_sylvester
 import matplotlib.pyplot as plt
 from deconvolucao.utils import normalize_image, mse, psnr
+from deconvolucao.sylvester import resultant_matrix
 
 # Caminhos
 base_dir = Path(__file__).parent.parent
@@ -23,30 +24,13 @@ linha2 = img_np[h//2 + 2, :]
 col1 = img_np[:, w//2 - 2]
 col2 = img_np[:, w//2 + 2]
 
-def sylvester_matrix(f, g):
-    m = len(f) - 1
-    n = len(g) - 1
-    size = m + n
-    F = np.pad(f, (0, size - m), 'constant')
-    G = np.pad(g, (0, size - n), 'constant')
-    S = np.zeros((size, size))
-    for i in range(n):
-        end = i + m + 1
-        if end <= size and (end - i) == len(F):
-            S[i, i:end] = F
-    for i in range(m):
-        end = i + n + 1
-        if end <= size and (end - i) == len(G):
-            S[n+i, i:end] = G
-    return S
-
 # 3. Definir grau do kernel próximo ao real (ex: 9)
 grau_kernel = 9
 
 # 4. Estimar PSF 1D para linhas
 f = linha1[:grau_kernel]
 g = linha2[:grau_kernel]
-S = sylvester_matrix(f, g)
+S = resultant_matrix(f, g)
 U, s, Vh = svd(S)
 psf_1d = Vh[-1, :grau_kernel]
 if np.sum(psf_1d) == 0:
@@ -58,7 +42,7 @@ else:
 # 5. Estimar PSF 1D para colunas
 f_col = col1[:grau_kernel]
 g_col = col2[:grau_kernel]
-S_col = sylvester_matrix(f_col, g_col)
+S_col = resultant_matrix(f_col, g_col)
 U_col, s_col, Vh_col = svd(S_col)
 psf_1d_col = Vh_col[-1, :grau_kernel]
 if np.sum(psf_1d_col) == 0:
@@ -1,5 +1,5 @@
 import numpy as np
-from scipy.fft import fft2, ifft2, fftshift
+from scipy.fft import fft2, ifft2
 
 def conv_simulation_fft(matrix, num_iterations, dt, dx=1, dy=1, alpha=1):
     """
@@ -34,8 +34,9 @@ def conv_simulation_fft(matrix, num_iterations, dt, dx=1, dy=1, alpha=1):
     kh, kw = kernel.shape
     kernel_padded[:kh, :kw] = kernel
 
-    # Centralizar o kernel para evitar deslocamentos na convolução via FFT
-    kernel_padded = fftshift(kernel_padded)
+    # Levar o centro do kernel (posição [1, 1]) para a origem, evitando
+    # deslocamentos na convolução via FFT (fftshift o levaria para o meio da matriz)
+    kernel_padded = np.roll(kernel_padded, (-1, -1), axis=(0, 1))
 
     # Transformada de Fourier do kernel e da matriz de entrada
     kernel_fft = fft2(kernel_padded)
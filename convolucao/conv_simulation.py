@@ -1,38 +1,162 @@
 import numpy as np
-from scipy.ndimage import convolve
+from scipy.fft import dstn, idstn
+from .core import solver_cache
+from .finite_diff_simulation import simulate_strips, strip_worker_count
 
-def conv_simulation(matrix, num_iterations, dt, dx=1, dy=1, alpha=1):
+# Linhas processadas por bloco no estêncil; mantém os rascunhos no cache
+BLOCK_ROWS = 64
+
+# A partir deste número de iterações o método 'auto' usa a DST
+SPECTRAL_MIN_ITERATIONS = 16
+
+# A DST-I de n pontos usa uma FFT de tamanho 2(n + 1); se n + 1 tiver um fator
+# primo maior que este, a FFT é bem mais lenta e 'auto' exige mais iterações
+SLOW_TRANSFORM_PRIME = 64
+SLOW_TRANSFORM_FACTOR = 4
+
+METHODS = ('auto', 'stencil', 'spectral')
+
+def _stencil_rows(current, out, row_start, row_stop, sigma_x, sigma_y, delta, term):
+    """
+    Escreve em out[row_start:row_stop] as linhas correspondentes de um passo
+    de current += convolve(current, kernel, mode='constant') com o estêncil de
+    5 pontos, em blocos de len(delta) linhas. Lê uma linha de halo de cada lado
+    da faixa; vizinhos fora da matriz valem zero.
+
+    Os termos são acumulados na mesma ordem que scipy.ndimage.convolve usa
+    (cima, esquerda, centro, direita, baixo), então o resultado é idêntico bit
+    a bit.
+    """
+    rows = current.shape[0]
+    center = -2 * (sigma_x + sigma_y)
+    block = len(delta)
+    for start in range(row_start, row_stop, block):
+        stop = min(start + block, row_stop)
+        n = stop - start
+        d = delta[:n]
+        t = term[:n]
+        # Cima (linha i-1); a primeira linha não tem
+        if start == 0:
+            d[0] = 0.0
+            np.multiply(current[:stop - 1], sigma_y, out=d[1:])
+        else:
+            np.multiply(current[start - 1:stop - 1], sigma_y, out=d)
+        # Esquerda (coluna j-1)
+        np.multiply(current[start:stop, :-1], sigma_x, out=t[:, 1:])
+        d[:, 1:] += t[:, 1:]
+        # Centro
+        np.multiply(current[start:stop], center, out=t)
+        d += t
+        # Direita (coluna j+1)
+        np.multiply(current[start:stop, 1:], sigma_x, out=t[:, :-1])
+        d[:, :-1] += t[:, :-1]
+        # Baixo (linha i+1); a última linha não tem
+        if stop == rows:
+            np.multiply(current[start + 1:stop], sigma_y, out=t[:n - 1])
+            d[:n - 1] += t[:n - 1]
+        else:
+            np.multiply(current[start + 1:stop + 1], sigma_y, out=t)
+            d += t
+        np.add(current[start:stop], d, out=out[start:stop])
+
+def _stencil_steps(U, num_iterations, sigma_x, sigma_y):
+    """
+    Aplica num_iterations passos do estêncil de 5 pontos (ver _stencil_rows)
+    em blocos de linhas e com dois buffers trocados a cada passo (sem
+    alocações por iteração). Idêntico bit a bit a scipy.ndimage.convolve.
+    """
+    rows, cols = U.shape
+    current = U
+    next_state = np.empty_like(U)
+    block = min(BLOCK_ROWS, rows)
+    delta = np.empty((block, cols))
+    term = np.empty((block, cols))
+
+    for _ in range(num_iterations):
+        _stencil_rows(current, next_state, 0, rows, sigma_x, sigma_y, delta, term)
+        current, next_state = next_state, current
+
+    return current
+
+def _spectral_steps(U, num_iterations, sigma_x, sigma_y):
+    """
+    Aplica os num_iterations passos de uma vez no domínio da DST tipo I.
+
+    Com vizinhos nulos fora da matriz (mode='constant'), o operador de um passo
+    é I + sigma_x*T_x + sigma_y*T_y, com T = tridiag(1, -2, 1) e borda de
+    Dirichlet, que a DST-I diagonaliza exatamente com autovalores
+    -4 sin^2(pi k / (2 (n + 1))). Os N passos viram a potência N desses
+    autovalores; o resultado coincide com o estêncil até o arredondamento.
+    """
+    rows, cols = U.shape
+
+    def compute():
+        lambda_y = -4 * sigma_y * np.sin(np.pi * np.arange(1, rows + 1) / (2 * (rows + 1))) ** 2
+        lambda_x = -4 * sigma_x * np.sin(np.pi * np.arange(1, cols + 1) / (2 * (cols + 1))) ** 2
+        return 1 + lambda_y[:, None] + lambda_x[None, :]
+
+    # Autovalores de um passo, compartilhados pelo cache de solvers do processo
+    step = solver_cache.get_or_compute(('conv_dst', (rows, cols), sigma_x, sigma_y), compute)
+    coefficients = dstn(U, type=1, norm='ortho')
+    coefficients *= step ** num_iterations
+    return idstn(coefficients, type=1, norm='ortho')
+
+def _has_large_prime_factor(n, bound):
+    """Indica se n tem algum fator primo maior que bound."""
+    for p in range(2, bound + 1):
+        while n % p == 0:
+            n //= p
+    return n > 1
+
+def _use_spectral(shape, num_iterations):
+    """Escolha do método 'auto': DST quando o número de passos amortiza as transformadas."""
+    threshold = SPECTRAL_MIN_ITERATIONS
+    if any(_has_large_prime_factor(n + 1, SLOW_TRANSFORM_PRIME) for n in shape):
+        threshold *= SLOW_TRANSFORM_FACTOR
+    return num_iterations >= threshold
+
+def conv_simulation(matrix, num_iterations, dt, dx=1, dy=1, alpha=1, method='auto', workers=1):
     """
     Executa a simulação de calor usando o método de convolução.
-    
+
     :param matrix: Matriz 2D de temperatura inicial (normalizada entre 0 e 1).
     :param num_iterations: Quantas iterações devem ser feitas.
     :param dt: Passo de tempo da simulação.
     :param dx: Resolução espacial no eixo x.
     :param dy: Resolução espacial no eixo y.
     :param alpha: Coeficiente de difusão térmica.
+    :param method: 'stencil' aplica o estêncil de 5 pontos a cada passo
+        (idêntico a scipy.ndimage.convolve); 'spectral' aplica todos os passos
+        de uma vez pela DST tipo I, com custo independente do número de
+        iterações; 'auto' usa 'spectral' a partir de SPECTRAL_MIN_ITERATIONS
+        (mais iterações quando as dimensões tornam a DST lenta).
+        Todos mantêm a borda de mode='constant' (zero fora da matriz).
+    :param workers: Processos que dividem o estêncil em faixas de linhas com a
+        matriz em memória compartilhada (None usa todos os núcleos). Vale para
+        o método 'stencil'; o resultado é o mesmo com qualquer valor.
     :return: Matriz 2D de temperatura final.
     """
+    if method not in METHODS:
+        raise ValueError(f"Método desconhecido '{method}'. Use um de {METHODS}")
+
     # Certificar que a matriz está normalizada
     matrix = np.clip(matrix, 0, 1)
-    # Calcular os fatores de espalhamento 
+    # Calcular os fatores de espalhamento
     sigma_x = alpha * dt / dx**2
     sigma_y = alpha * dt / dy**2
-    sigma = sigma_x + sigma_y 
+    sigma = sigma_x + sigma_y
 
     # Verificar estabilidade
     assert sigma <= 0.5, "Condição de estabilidade violada! Reduza dt ou aumente dx/dy."
 
-    # Kernel para convolução
-    kernel = np.array([[0, sigma_y, 0],
-                       [sigma_x, -2 * sigma, sigma_x],
-                       [0, sigma_y, 0]])
-
     # Copiar a matriz inicial para a simulação
-    U = matrix.copy()
-
-    # Iterações da simulação
-    for _ in range(num_iterations):
-        U += convolve(U, kernel, mode='constant', cval=0.0)
+    U = np.array(matrix, dtype=np.float64)
 
-    return U
+    if method == 'auto':
+        method = 'spectral' if _use_spectral(U.shape, num_iterations) else 'stencil'
+    if method == 'spectral':
+        return _spectral_steps(U, num_iterations, sigma_x, sigma_y)
+    workers = strip_worker_count(workers, U.shape[0])
+    if workers > 1 and num_iterations > 0:
+        return simulate_strips(U, num_iterations, workers, 'zero', (dt, dx, dy, alpha))
+    return _stencil_steps(U, num_iterations, sigma_x, sigma_y)
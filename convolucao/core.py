@@ -1,6 +1,168 @@
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+import threading
 import numpy as np
-from typing import Tuple, Optional
+from typing import Any, Callable, Dict, Hashable, List, Sequence, Tuple, Optional, Union
+
+class SolverCache:
+    """
+    Process-wide LRU cache for precomputed solvers and transfer functions
+    (factorizations, kernel spectra, eigenvalues), shared by all simulation
+    instances. Entries are evicted least-recently-used first once their total
+    size exceeds the byte budget.
+    """
+    
+    def __init__(self, max_bytes: int = 256 * 2**20):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_bytes: Byte budget for all cached arrays
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _nbytes(value: Any) -> int:
+        """Size of the arrays held by a cached value (arrays or nested tuples/lists of them)."""
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        if isinstance(value, (tuple, list)):
+            return sum(SolverCache._nbytes(item) for item in value)
+        return 0
+    
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for `key`, computing and storing it on a miss.
+        
+        Args:
+            key: Hashable description of the solver, e.g. (method, shape, dt, dx, dy, alpha)
+            compute: Function building the value when it is not cached
+            
+        Returns:
+            The cached or freshly computed value
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+        
+        value = compute()
+        size = self._nbytes(value)
+        with self._lock:
+            if size <= self.max_bytes and key not in self._entries:
+                self._entries[key] = (value, size)
+                self._bytes += size
+                self._evict()
+        return value
+    
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits its budget."""
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+    
+    def configure(self, max_bytes: int) -> None:
+        """Change the byte budget, evicting entries if needed."""
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be non-negative")
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+    
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and current usage."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+# Shared by every HeatSimulation instance in the process
+solver_cache = SolverCache()
+
+class SteadyStateMonitor:
+    """
+    Tracks how much a field changes between checks and decides when it has
+    settled. The residual is the change since the previous check divided by
+    the number of steps in between, so the tolerance does not depend on how
+    often the field is checked. It is computed in a preallocated buffer.
+    """
+    
+    NORMS = ('max', 'l2')
+    
+    def __init__(self, tolerance: float, check_every: int = 10, norm: str = 'max'):
+        """
+        Initialize the monitor.
+        
+        Args:
+            tolerance: The field is steady once the residual is at or below this
+            check_every: Number of steps between checks
+            norm: 'max' (largest absolute change) or 'l2' (root-mean-square change,
+                the L2 norm divided by the square root of the number of cells)
+        """
+        if tolerance < 0:
+            raise ValueError("tolerance must be non-negative")
+        if check_every < 1:
+            raise ValueError("check_every must be at least 1")
+        if norm not in self.NORMS:
+            raise ValueError(f"Unknown norm '{norm}'. Choose one of {self.NORMS}")
+        self.tolerance = tolerance
+        self.check_every = check_every
+        self.norm = norm
+        self.iterations = 0
+        self.history: List[Tuple[int, float]] = []
+        self._previous = None
+        self._scratch = None
+    
+    def start(self, state: np.ndarray) -> None:
+        """Record the initial state and clear the history."""
+        self._previous = np.array(state, dtype=np.float64)
+        self._scratch = np.empty_like(self._previous)
+        self.iterations = 0
+        self.history = []
+    
+    def update(self, state: np.ndarray, steps: int) -> bool:
+        """
+        Compare `state`, reached `steps` steps after the previous check, with
+        that check and record the residual.
+        
+        Returns:
+            True when the residual is within the tolerance
+        """
+        scratch = self._scratch
+        np.subtract(state, self._previous, out=scratch)
+        if self.norm == 'max':
+            np.abs(scratch, out=scratch)
+            change = scratch.max(initial=0.0)
+        else:
+            np.square(scratch, out=scratch)
+            change = np.sqrt(scratch.mean()) if scratch.size else 0.0
+        residual = float(change) / max(steps, 1)
+        
+        self.iterations += steps
+        self.history.append((self.iterations, residual))
+        np.copyto(self._previous, state)
+        return residual <= self.tolerance
 
 class HeatSimulation(ABC):
     """Base class for heat simulation methods."""
@@ -33,6 +195,17 @@ class HeatSimulation(ABC):
         if not np.all(np.isfinite(matrix)):
             raise ValueError("Input matrix contains invalid values")
     
+    def _cached(self, method: str, shape: Tuple[int, ...], compute: Callable[[], Any],
+                dt: Optional[float] = None) -> Any:
+        """
+        Fetch a precomputed solver for this configuration from the process-wide cache.
+        The key is (method, shape, dt, dx, dy, alpha); `dt` defaults to self.dt
+        and is given explicitly by engines that change the step size.
+        """
+        dt = self.dt if dt is None else dt
+        key = (method, tuple(shape), dt, self.dx, self.dy, self.alpha)
+        return solver_cache.get_or_compute(key, compute)
+    
     def _normalize_matrix(self, matrix: np.ndarray) -> np.ndarray:
         """Normalize matrix values to [0, 1] range."""
         return np.clip(matrix, 0, 1)
@@ -50,6 +223,144 @@ class HeatSimulation(ABC):
             Final temperature matrix
         """
         pass
+    
+    def simulate_until_steady(self, matrix: np.ndarray, max_iterations: int,
+                              tolerance: float = 1e-6, check_every: int = 10,
+                              norm: str = 'max') -> Tuple[np.ndarray, int]:
+        """
+        Run the heat simulation until the field stops changing.
+        
+        Every `check_every` steps the change since the previous check is
+        measured (see SteadyStateMonitor); the run stops at the first check whose
+        per-step residual is within `tolerance`, or after max_iterations.
+        Stopping at iteration N gives the same field as simulate(matrix, N)
+        (up to rounding for the spectral engines).
+        The residuals of every check are kept in self.residual_history as
+        (iteration, residual) pairs.
+        
+        Args:
+            matrix: Initial temperature matrix (2D numpy array)
+            max_iterations: Iteration budget
+            tolerance: Per-step change below which the field counts as steady
+            check_every: Number of steps between checks
+            norm: 'max' or 'l2' residual
+            
+        Returns:
+            Tuple of (final temperature matrix, number of iterations used)
+        """
+        if max_iterations < 0:
+            raise ValueError("max_iterations must be non-negative")
+        monitor = SteadyStateMonitor(tolerance, check_every, norm)
+        self._validate_input_matrix(matrix)
+        current = np.array(self._normalize_matrix(matrix), dtype=np.float64)
+        monitor.start(current)
+        
+        while monitor.iterations < max_iterations:
+            steps = min(check_every, max_iterations - monitor.iterations)
+            current = self._advance(current, steps)
+            if monitor.update(current, steps):
+                break
+        
+        self.residual_history = monitor.history
+        return self._normalize_matrix(current), monitor.iterations
+    
+    def _advance(self, current: np.ndarray, num_iterations: int) -> np.ndarray:
+        """
+        Advance a normalized float64 matrix by num_iterations steps, for
+        simulate_until_steady. Engines override this with their raw step loop;
+        the default calls simulate, which also clips every chunk.
+        """
+        return self.simulate(current, num_iterations)
+    
+    def simulate_batch(self, stack: np.ndarray, iterations_per_channel: Union[int, Sequence[int]],
+                       channel_axis: int = -1) -> np.ndarray:
+        """
+        Run the heat simulation on every channel of a stack in one pass.
+        Factorizations and transforms are shared by all channels.
+        
+        Args:
+            stack: Initial temperature stack, (H, W, C) with channel_axis=-1
+                or (B, H, W) with channel_axis=0
+            iterations_per_channel: Number of iterations for each channel,
+                or a single int used for all of them (integer dtype only;
+                fractional counts raise ValueError instead of being truncated)
+            channel_axis: Axis of `stack` that indexes the channels
+            
+        Returns:
+            Final temperature stack with the same shape as `stack`
+        """
+        if not isinstance(stack, np.ndarray) or stack.ndim != 3:
+            raise ValueError("Input must be a 3D numpy array")
+        if not np.all(np.isfinite(stack)):
+            raise ValueError("Input matrix contains invalid values")
+        
+        frames = np.moveaxis(stack, channel_axis, 0)
+        iterations = np.asarray(iterations_per_channel)
+        if iterations.ndim == 0:
+            iterations = np.full(frames.shape[0], iterations)
+        if iterations.shape != (frames.shape[0],):
+            raise ValueError(
+                f"Expected {frames.shape[0]} iteration counts, got {iterations.shape[0]}"
+            )
+        if not np.issubdtype(iterations.dtype, np.integer):
+            raise ValueError(f"Iteration counts must be integers, got dtype {iterations.dtype}")
+        if np.any(iterations < 0):
+            raise ValueError("Iteration counts must be non-negative")
+        
+        frames = np.ascontiguousarray(self._normalize_matrix(frames), dtype=np.float64)
+        result = self._simulate_frames(frames, iterations.astype(int))
+        return np.moveaxis(result, 0, channel_axis)
+    
+    def _simulate_frames(self, frames: np.ndarray, iterations: np.ndarray) -> np.ndarray:
+        """
+        Simulate a (B, H, W) stack of normalized frames, each with its own iteration count.
+        Engines override this with a vectorized pass; the default runs them one by one.
+        """
+        return np.stack([self.simulate(frame, int(n)) for frame, n in zip(frames, iterations)])
+    
+    def _check_batch_heat_conservation(self, initial_heat: np.ndarray, result: np.ndarray) -> None:
+        """Warn about every frame of a (B, H, W) result whose total heat drifted."""
+        final_heat = result.sum(axis=(1, 2))
+        for channel in np.flatnonzero(~np.isclose(initial_heat, final_heat, rtol=1e-5)):
+            print(f"Warning: Heat conservation violated in channel {channel}. "
+                  f"Initial: {initial_heat[channel]:.3f}, Final: {final_heat[channel]:.3f}")
+    
+    def _iterate_batch(self, frames: np.ndarray, iterations: np.ndarray,
+                       step: Callable[[np.ndarray, np.ndarray], None]) -> np.ndarray:
+        """
+        Advance every frame by its own number of iterations, stepping all
+        unfinished frames together.
+        
+        Frames are sorted by iteration count so the unfinished ones are always a
+        contiguous suffix of the stack, and two buffers are swapped every step.
+        
+        Args:
+            frames: (B, H, W) stack of initial frames
+            iterations: Number of iterations for each frame
+            step: Function step(state, out) writing one iteration of the
+                (k, H, W) stack `state` into `out`
+            
+        Returns:
+            (B, H, W) stack of final frames, in the original order
+        """
+        order = np.argsort(iterations, kind='stable')
+        counts = iterations[order]
+        current = frames[order]
+        spare = np.empty_like(current)
+        result = np.empty_like(current)
+        
+        done = 0
+        for n in range(int(counts.max(initial=0)) + 1):
+            # Collect the frames that reached their own iteration count
+            finished = int(np.searchsorted(counts, n, side='right'))
+            result[order[done:finished]] = current[done:finished]
+            done = finished
+            if done == len(counts):
+                break
+            step(current[done:], spare[done:])
+            current, spare = spare, current
+        
+        return result
 
 def create_kernel(sigma_x: float, sigma_y: float) -> np.ndarray:
     """
@@ -100,6 +411,75 @@ def calculate_stability_criterion(dt: float, dx: float, dy: float, alpha: float)
     """
     return dt * alpha * (1/dx**2 + 1/dy**2)
 
+def integrate_adaptive(state: np.ndarray, total_time: float, dt: float,
+                       step: Callable[[np.ndarray, float], np.ndarray], order: int = 1,
+                       tolerance: float = 1e-3, max_dt: Optional[float] = None,
+                       max_halvings: int = 10) -> Tuple[np.ndarray, List[float], int]:
+    """
+    Advance `state` to `total_time` with step-doubling error control.
+    
+    Each attempt compares one step of size h with two steps of size h/2; their
+    difference, divided by 2**order - 1, estimates the local error of the two
+    half steps, which are kept when the attempt is accepted. Rejected attempts
+    halve h, and h doubles once the estimate leaves room for it. Step sizes stay
+    on the ladder dt * 2**k (except a final step shortened to land on
+    `total_time`), so engines that factor a solver per step size reuse a few.
+    
+    Args:
+        state: Initial state (not modified)
+        total_time: Time to reach
+        dt: Initial step size and base of the step-size ladder
+        step: Function step(state, h) returning a new state advanced by h
+        order: Order of accuracy in time of `step`
+        tolerance: Largest accepted local error (max norm) per step
+        max_dt: Upper bound for the step size (None for no bound)
+        max_halvings: The smallest step is dt / 2**max_halvings; attempts at that
+            size are accepted whatever their error estimate
+            
+    Returns:
+        Tuple of (final state, accepted step sizes, number of rejected attempts)
+    """
+    if total_time < 0:
+        raise ValueError("total_time must be non-negative")
+    if dt <= 0 or tolerance <= 0:
+        raise ValueError("dt and tolerance must be positive")
+    max_level = np.inf if max_dt is None else np.floor(np.log2(max_dt / dt))
+    if max_level < -max_halvings:
+        raise ValueError("max_dt is smaller than the smallest step size")
+    
+    level = int(min(0, max_level))
+    time = 0.0
+    steps: List[float] = []
+    rejected = 0
+    # A rejected attempt already computed the first half step, which is the
+    # full step of the next attempt
+    reuse: Optional[Tuple[float, np.ndarray]] = None
+    while total_time - time > 1e-12 * total_time:
+        h = min(dt * 2.0**level, total_time - time)
+        if reuse is not None and reuse[0] == h:
+            full = reuse[1]
+        else:
+            full = step(state, h)
+        first_half = step(state, h / 2)
+        half = step(first_half, h / 2)
+        error = np.max(np.abs(half - full)) / (2**order - 1)
+        
+        if error > tolerance and level > -max_halvings:
+            level -= 1
+            rejected += 1
+            reuse = (h / 2, first_half)
+            continue
+        
+        reuse = None
+        state = half
+        time += h
+        steps.append(h)
+        # The local error scales as h**(order + 1)
+        if error * 2**(order + 1) <= tolerance and level < max_level:
+            level += 1
+    
+    return state, steps, rejected
+
 def calculate_total_heat(matrix: np.ndarray) -> float:
     """
     Calculate the total heat in the system (sum of all temperatures).
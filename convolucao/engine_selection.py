@@ -0,0 +1,247 @@
+import math
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from .core import HeatSimulation, calculate_stability_criterion
+from .finite_diff_simulation import FiniteDiffHeatSimulation
+from .dct_simulation import DCTHeatSimulation
+from .adi_heat_simulation import ADIHeatSimulation
+
+class CostModel:
+    """
+    Runtime and memory model of the heat engines.
+
+    Time is modelled as a + b * work, where work is pixels * iterations for
+    the stepping engines and pixels * log2(pixels) for the spectral engine,
+    whose cost does not depend on the iteration count.
+    """
+
+    # (a, b) in seconds, measured with convolucao.benchmark on a single core
+    DEFAULT_COEFFICIENTS = {
+        'explicit': (1e-4, 9e-9),
+        'adi': (1e-4, 3.7e-8),
+        'spectral': (1e-3, 6e-9),
+    }
+
+    # Benchmark engine names used to calibrate each model
+    BENCHMARK_ENGINES = {'finite_diff': 'explicit', 'adi': 'adi', 'dct': 'spectral'}
+
+    # Full-frame float64 arrays alive at the same time
+    FRAMES_IN_MEMORY = {'explicit': 3, 'adi': 4, 'spectral': 3}
+
+    def __init__(self, coefficients: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.coefficients = dict(self.DEFAULT_COEFFICIENTS)
+        if coefficients:
+            self.coefficients.update(coefficients)
+
+    @staticmethod
+    def work(engine: str, shape: Tuple[int, int], iterations: int) -> float:
+        """Work measure the engine's runtime is proportional to."""
+        pixels = shape[0] * shape[1]
+        if engine == 'spectral':
+            return pixels * math.log2(max(pixels, 2))
+        return pixels * iterations
+
+    def estimate_seconds(self, engine: str, shape: Tuple[int, int], iterations: int) -> float:
+        """Estimated wall time of a full-frame run."""
+        a, b = self.coefficients[engine]
+        return a + b * self.work(engine, shape, iterations)
+
+    def memory_bytes(self, engine: str, shape: Tuple[int, int]) -> int:
+        """Estimated peak memory of a full-frame run."""
+        return self.FRAMES_IN_MEMORY[engine] * shape[0] * shape[1] * 8
+
+    @classmethod
+    def from_benchmark(cls, results: Union[str, List[Dict]]) -> 'CostModel':
+        """
+        Fit the coefficients to benchmark results.
+
+        Args:
+            results: Records from convolucao.benchmark.run_benchmark, or the
+                path of a JSON/CSV file written by it
+
+        Returns:
+            Calibrated cost model (engines without data keep the defaults)
+        """
+        if isinstance(results, str):
+            from .benchmark import load_results
+            results = load_results(results)
+
+        coefficients = {}
+        for benchmark_engine, engine in cls.BENCHMARK_ENGINES.items():
+            rows = [r for r in results if r['engine'] == benchmark_engine and r['status'] == 'ok']
+            if len(rows) < 2:
+                continue
+            work = np.array([cls.work(engine, (int(r['size']), int(r['size'])), int(r['iterations']))
+                             for r in rows])
+            seconds = np.array([r['time_min_s'] for r in rows])
+            # Least squares on relative error, so small cases count as much as large ones
+            design = np.column_stack([np.ones_like(work), work]) / seconds[:, None]
+            (a, b), *_ = np.linalg.lstsq(design, np.ones_like(seconds), rcond=None)
+            coefficients[engine] = (max(float(a), 0.0), max(float(b), 1e-15))
+        return cls(coefficients)
+
+# Boundary model each engine solves, in the terms of convolucao.benchmark:
+# 'copy' updates the interior and copies the edge cells from their inner
+# neighbour (the explicit stencil's problem), 'neumann' is zero flux through
+# mirrored ghost cells on the whole frame
+ENGINE_BOUNDARIES = {'explicit': 'copy', 'tiled': 'copy', 'adi': 'copy', 'spectral': 'neumann'}
+
+# How each engine's discrete problem departs from the explicit stencil
+MODEL_DIFFERENCES = {
+    'adi': "implicit time steps whose line solves hold the frame edge at zero before "
+           "the edges are copied back, so heat leaks out and the result drifts from "
+           "the explicit one as dt grows",
+    'spectral': "zero-flux boundary on the whole frame instead of copied edges, so the "
+                "result differs from the explicit one near the edges",
+}
+
+@dataclass
+class EngineChoice:
+    """Engine picked by auto_simulator, with the reasoning behind it."""
+    engine: str
+    simulator: HeatSimulation
+    num_iterations: int
+    reason: str
+    estimated_seconds: Dict[str, float] = field(default_factory=dict)
+    tile_size: Optional[int] = None
+    steps_per_pass: Optional[int] = None
+
+    def run(self, matrix: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Run the chosen engine.
+
+        Args:
+            matrix: Initial temperature matrix
+            out: Output array (e.g. a writable numpy.memmap); required for 'tiled'
+
+        Returns:
+            Final temperature matrix
+        """
+        if self.engine == 'tiled':
+            if out is None:
+                raise ValueError("Tiled execution needs an output array (e.g. a numpy.memmap)")
+            return self.simulator.simulate_out_of_core(
+                matrix, self.num_iterations, out,
+                tile_size=self.tile_size, steps_per_pass=self.steps_per_pass
+            )
+        result = self.simulator.simulate(matrix, self.num_iterations)
+        if out is not None:
+            out[...] = result
+            return out
+        return result
+
+def _plan_tiles(memory_budget: int, iterations: int) -> Tuple[int, int, float]:
+    """
+    Choose tile core size and steps per pass for a memory budget.
+
+    Returns:
+        (tile_size, steps_per_pass, work overhead factor from the halos)
+    """
+    side = int(math.sqrt(memory_budget / (CostModel.FRAMES_IN_MEMORY['explicit'] * 8)))
+    steps_per_pass = max(min(iterations, side // 4), 1)
+    tile_size = side - 2 * steps_per_pass
+    if tile_size < 1:
+        raise ValueError(f"Memory budget of {memory_budget} bytes is too small for tiled execution")
+    return tile_size, steps_per_pass, (side / tile_size) ** 2
+
+def auto_simulator(shape: Tuple[int, int], dt: float, iterations: int,
+                   dx: float = 1.0, dy: float = 1.0, alpha: float = 1.0,
+                   memory_budget: Optional[int] = None,
+                   cost_model: Optional[CostModel] = None,
+                   boundaries: Sequence[str] = ('copy',)) -> EngineChoice:
+    """
+    Pick the fastest engine for a problem from the cost model, honouring the
+    stability limit of the explicit scheme, an optional memory budget and the
+    boundary models the caller accepts (see ENGINE_BOUNDARIES).
+
+    - 'explicit': FiniteDiffHeatSimulation, only when stable ('copy')
+    - 'adi': ADIHeatSimulation, unconditionally stable ('copy', but a different
+      time discretization that loses heat at the edges)
+    - 'spectral': DCTHeatSimulation ('neumann'); applies the explicit stencil's
+      transfer function when stable and the exact heat kernel otherwise, but
+      on the whole frame, so it does not reproduce the explicit result
+    - 'tiled': FiniteDiffHeatSimulation.simulate_out_of_core, when the full
+      frame does not fit in `memory_budget` ('copy')
+
+    Args:
+        shape: Frame shape (height, width)
+        dt: Time step
+        iterations: Number of simulation iterations
+        dx: Spatial step in x direction
+        dy: Spatial step in y direction
+        alpha: Thermal diffusivity coefficient
+        memory_budget: Maximum bytes for the engine's working set (None: unlimited)
+        cost_model: Cost model to use, e.g. CostModel.from_benchmark(...)
+        boundaries: Boundary models the caller accepts. The default keeps the
+            explicit stencil's problem; add 'neumann' to allow 'spectral'.
+
+    Returns:
+        EngineChoice with the configured simulator and the reason for the choice
+    """
+    unknown = set(boundaries) - set(ENGINE_BOUNDARIES.values())
+    if unknown:
+        raise ValueError(f"Unknown boundary models {sorted(unknown)}. "
+                         f"Choose from {sorted(set(ENGINE_BOUNDARIES.values()))}")
+    cost_model = cost_model or CostModel()
+    shape = tuple(shape)
+    criterion = calculate_stability_criterion(dt, dx, dy, alpha)
+    stable = criterion <= 0.5
+
+    notes = []
+    engines = ['adi', 'spectral']
+    if stable:
+        engines.insert(0, 'explicit')
+    else:
+        notes.append(f"explicit excluded: stability criterion {criterion:.3f} > 0.5")
+        if ENGINE_BOUNDARIES['spectral'] in boundaries:
+            notes.append("spectral uses the exact heat kernel")
+    for engine in list(engines):
+        if ENGINE_BOUNDARIES[engine] not in boundaries:
+            notes.append(f"{engine} excluded: solves the '{ENGINE_BOUNDARIES[engine]}' "
+                         f"boundary model, accepted: {', '.join(boundaries)}")
+            engines.remove(engine)
+
+    estimates = {engine: cost_model.estimate_seconds(engine, shape, iterations) for engine in engines}
+
+    tiling = None
+    if memory_budget is not None:
+        for engine in list(estimates):
+            needed = cost_model.memory_bytes(engine, shape)
+            if needed > memory_budget:
+                notes.append(f"{engine} excluded: needs ~{needed / 2**20:.3g} MB, "
+                             f"budget is {memory_budget / 2**20:.3g} MB")
+                del estimates[engine]
+        if not estimates and stable and ENGINE_BOUNDARIES['tiled'] in boundaries:
+            tiling = _plan_tiles(memory_budget, iterations)
+            estimates['tiled'] = tiling[2] * cost_model.estimate_seconds('explicit', shape, iterations)
+
+    if not estimates:
+        raise ValueError("No engine fits this problem: " + "; ".join(notes))
+
+    engine = min(estimates, key=estimates.get)
+    others = ", ".join(f"{name} ~{seconds:.3g}s" for name, seconds in estimates.items() if name != engine)
+    reason = f"{engine} has the lowest estimated time (~{estimates[engine]:.3g}s"
+    reason += f"; {others})" if others else ")"
+    reason += f". Boundary model: {ENGINE_BOUNDARIES[engine]}"
+    if engine in MODEL_DIFFERENCES:
+        reason += f" ({MODEL_DIFFERENCES[engine]})"
+    if notes:
+        reason += ". " + "; ".join(notes)
+
+    if engine in ('explicit', 'tiled'):
+        simulator = FiniteDiffHeatSimulation(dt, dx, dy, alpha)
+    elif engine == 'adi':
+        simulator = ADIHeatSimulation(dt, dx, dy, alpha)
+    else:
+        simulator = DCTHeatSimulation(dt, dx, dy, alpha, propagator='power' if stable else 'exact')
+
+    return EngineChoice(
+        engine=engine,
+        simulator=simulator,
+        num_iterations=iterations,
+        reason=reason,
+        estimated_seconds=estimates,
+        tile_size=tiling[0] if tiling else None,
+        steps_per_pass=tiling[1] if tiling else None,
+    )
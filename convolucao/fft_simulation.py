@@ -1,15 +1,34 @@
 import numpy as np
-from scipy.fft import fft2, ifft2, fftshift, ifftshift
+from scipy.fft import fft2, ifft2, fftshift, ifftshift, fftfreq
 from typing import Tuple
 from .core import (
-    HeatSimulation, create_kernel, calculate_diffusion_coefficients,
+    HeatSimulation, SteadyStateMonitor, create_kernel, calculate_diffusion_coefficients,
     calculate_total_heat, calculate_heat_flux
 )
 
 class FFTHeatSimulation(HeatSimulation):
     """Heat simulation using FFT-based convolution."""
     
-    def __init__(self, dt: float, dx: float = 1.0, dy: float = 1.0, alpha: float = 1.0):
+    PROPAGATORS = ('iterative', 'power', 'exact')
+    
+    def __init__(self, dt: float, dx: float = 1.0, dy: float = 1.0, alpha: float = 1.0,
+                 propagator: str = 'power'):
+        """
+        Initialize the FFT heat simulation.
+        
+        Args:
+            dt: Time step
+            dx: Spatial step in x direction
+            dy: Spatial step in y direction
+            alpha: Thermal diffusivity coefficient
+            propagator: How the N-step evolution is applied in frequency domain:
+                'iterative' multiplies by the one-step transfer function N times,
+                'power' raises it to the N-th power in a single operation,
+                'exact' uses the continuous-time heat kernel exp(-alpha*t*|k|^2)
+        """
+        if propagator not in self.PROPAGATORS:
+            raise ValueError(f"Unknown propagator '{propagator}'. Choose one of {self.PROPAGATORS}")
+        self.propagator = propagator
         super().__init__(dt, dx, dy, alpha)
         self._kernel_fft = None
         self._kernel_shape = None
@@ -22,32 +41,38 @@ class FFTHeatSimulation(HeatSimulation):
         Args:
             matrix_shape: Shape of the input matrix (height, width)
         """
+        matrix_shape = tuple(matrix_shape)
         if self._kernel_shape == matrix_shape:
             return
-            
-        # Calculate diffusion coefficients using utility function
-        sigma_x, sigma_y = calculate_diffusion_coefficients(
-            self.dt, self.dx, self.dy, self.alpha
-        )
-        
-        # Create kernel
-        kernel = create_kernel(sigma_x, sigma_y)
         
-        # Pad kernel to optimal size for FFT
-        padded_shape = self._get_optimal_fft_shape(matrix_shape)
-        kernel_padded = np.zeros(padded_shape)
-        kh, kw = kernel.shape
-        
-        # Place kernel in center of padded array
-        center_y = padded_shape[0] // 2 - kh // 2
-        center_x = padded_shape[1] // 2 - kw // 2
-        kernel_padded[center_y:center_y + kh, center_x:center_x + kw] = kernel
-        
-        # Normalize kernel to preserve heat
-        kernel_padded = kernel_padded / np.sum(kernel_padded)
+        def compute():
+            # Calculate diffusion coefficients using utility function
+            sigma_x, sigma_y = calculate_diffusion_coefficients(
+                self.dt, self.dx, self.dy, self.alpha
+            )
+            
+            # Create kernel
+            kernel = create_kernel(sigma_x, sigma_y)
+            
+            # Pad kernel to optimal size for FFT
+            padded_shape = self._get_optimal_fft_shape(matrix_shape)
+            kernel_padded = np.zeros(padded_shape)
+            kh, kw = kernel.shape
+            
+            # Place kernel in center of padded array
+            center_y = padded_shape[0] // 2 - kh // 2
+            center_x = padded_shape[1] // 2 - kw // 2
+            kernel_padded[center_y:center_y + kh, center_x:center_x + kw] = kernel
+            
+            # Move kernel center to the origin so the transfer function has no phase shift.
+            # The stencil already sums to zero, which is what preserves heat.
+            kernel_padded = ifftshift(kernel_padded)
+            
+            # Compute FFT
+            return fft2(kernel_padded)
         
-        # Compute FFT
-        self._kernel_fft = fft2(kernel_padded)
+        # Shared process-wide through the solver cache
+        self._kernel_fft = self._cached('fft', matrix_shape, compute)
         self._kernel_shape = matrix_shape
     
     def _get_optimal_fft_shape(self, matrix_shape: Tuple[int, int]) -> Tuple[int, int]:
@@ -60,27 +85,60 @@ class FFTHeatSimulation(HeatSimulation):
         
         return (next_power_of_2(matrix_shape[0]), next_power_of_2(matrix_shape[1]))
     
+    def _get_padding_offset(self, matrix_shape: Tuple[int, int]) -> Tuple[int, int]:
+        """Get the position of the original matrix inside the padded array."""
+        padded_shape = self._get_optimal_fft_shape(matrix_shape)
+        return (padded_shape[0] // 2 - matrix_shape[0] // 2,
+                padded_shape[1] // 2 - matrix_shape[1] // 2)
+    
+    def _compute_propagator(self, matrix_shape: Tuple[int, int], num_iterations: int) -> np.ndarray:
+        """
+        Compute the transfer function of the whole N-step evolution in one operation.
+        
+        Args:
+            matrix_shape: Shape of the input matrix (height, width)
+            num_iterations: Number of simulation iterations, or one count per frame
+                of a stack
+            
+        Returns:
+            Propagator on the padded frequency grid, stacked along a leading
+            axis when `num_iterations` is an array
+        """
+        num_iterations = np.asarray(num_iterations)[..., np.newaxis, np.newaxis]
+        if self.propagator == 'exact':
+            # Continuous heat kernel, separable in x and y
+            padded_shape = self._get_optimal_fft_shape(matrix_shape)
+            t = num_iterations * self.dt
+            ky = 2 * np.pi * fftfreq(padded_shape[0], d=self.dy)
+            kx = 2 * np.pi * fftfreq(padded_shape[1], d=self.dx)
+            propagator = np.exp(-self.alpha * t * ky[:, None]**2) * np.exp(-self.alpha * t * kx[None, :]**2)
+        else:
+            self._compute_kernel_fft(matrix_shape)
+            propagator = (1 + self._kernel_fft) ** num_iterations
+        return propagator
+    
     def _pad_matrix(self, matrix: np.ndarray) -> np.ndarray:
-        """Pad matrix to optimal FFT size with Neumann boundary conditions."""
-        padded_shape = self._get_optimal_fft_shape(matrix.shape)
-        padded = np.zeros(padded_shape)
+        """Pad matrix (or the last two axes of a stack) to optimal FFT size with Neumann boundary conditions."""
+        *lead, height, width = matrix.shape
+        padded_shape = self._get_optimal_fft_shape((height, width))
+        padded = np.zeros((*lead, *padded_shape))
         
         # Copy original matrix to center
-        center_y = padded_shape[0] // 2 - matrix.shape[0] // 2
-        center_x = padded_shape[1] // 2 - matrix.shape[1] // 2
-        padded[center_y:center_y + matrix.shape[0], center_x:center_x + matrix.shape[1]] = matrix
+        center_y, center_x = self._get_padding_offset((height, width))
+        padded[..., center_y:center_y + height, center_x:center_x + width] = matrix
         
         # Apply Neumann boundary conditions to padded regions
-        padded[:center_y, :] = padded[center_y:center_y+1, :]  # Top
-        padded[center_y + matrix.shape[0]:, :] = padded[center_y + matrix.shape[0]-1:center_y + matrix.shape[0], :]  # Bottom
-        padded[:, :center_x] = padded[:, center_x:center_x+1]  # Left
-        padded[:, center_x + matrix.shape[1]:] = padded[:, center_x + matrix.shape[1]-1:center_x + matrix.shape[1]]  # Right
+        padded[..., :center_y, :] = padded[..., center_y:center_y+1, :]  # Top
+        padded[..., center_y + height:, :] = padded[..., center_y + height-1:center_y + height, :]  # Bottom
+        padded[..., :, :center_x] = padded[..., :, center_x:center_x+1]  # Left
+        padded[..., :, center_x + width:] = padded[..., :, center_x + width-1:center_x + width]  # Right
         
         return padded
     
     def _unpad_matrix(self, padded_matrix: np.ndarray, original_shape: Tuple[int, int]) -> np.ndarray:
-        """Remove padding from matrix."""
-        return padded_matrix[:original_shape[0], :original_shape[1]]
+        """Remove padding from matrix (or the last two axes of a stack)."""
+        center_y, center_x = self._get_padding_offset(original_shape)
+        return padded_matrix[..., center_y:center_y + original_shape[0], center_x:center_x + original_shape[1]]
     
     def simulate(self, matrix: np.ndarray, num_iterations: int) -> np.ndarray:
         """
@@ -99,16 +157,17 @@ class FFTHeatSimulation(HeatSimulation):
         # Store initial heat for conservation check
         self._initial_heat = calculate_total_heat(matrix)
         
-        # Compute and cache kernel FFT
-        self._compute_kernel_fft(matrix.shape)
-        
         # Pad matrix for FFT
         padded_matrix = self._pad_matrix(matrix)
         matrix_fft = fft2(padded_matrix)
         
         # Apply kernel in frequency domain
-        for _ in range(num_iterations):
-            matrix_fft = matrix_fft * (1 + self._kernel_fft)  # Use multiplication for stability
+        if self.propagator == 'iterative':
+            self._compute_kernel_fft(matrix.shape)
+            for _ in range(num_iterations):
+                matrix_fft = matrix_fft * (1 + self._kernel_fft)  # Use multiplication for stability
+        else:
+            matrix_fft = matrix_fft * self._compute_propagator(matrix.shape, num_iterations)
         
         # Transform back to spatial domain and unpad
         result = np.real(ifft2(matrix_fft))
@@ -120,4 +179,71 @@ class FFTHeatSimulation(HeatSimulation):
         if not np.isclose(self._initial_heat, final_heat, rtol=1e-5):
             print(f"Warning: Heat conservation violated. Initial: {self._initial_heat:.3f}, Final: {final_heat:.3f}")
         
-        return result 
\ No newline at end of file
+        return result
+    
+    def simulate_until_steady(self, matrix: np.ndarray, max_iterations: int,
+                              tolerance: float = 1e-6, check_every: int = 10,
+                              norm: str = 'max') -> Tuple[np.ndarray, int]:
+        """
+        Run the FFT simulation until the field stops changing (see
+        HeatSimulation.simulate_until_steady).
+        
+        The spectrum stays on the padded grid for the whole run: each check
+        applies the propagator of `check_every` steps (computed once) and one
+        inverse FFT to measure the change of the frame.
+        
+        Returns:
+            Tuple of (final temperature matrix, number of iterations used)
+        """
+        if max_iterations < 0:
+            raise ValueError("max_iterations must be non-negative")
+        monitor = SteadyStateMonitor(tolerance, check_every, norm)
+        self._validate_input_matrix(matrix)
+        matrix = self._normalize_matrix(matrix)
+        
+        # Store initial heat for conservation check
+        self._initial_heat = calculate_total_heat(matrix)
+        
+        matrix_fft = fft2(self._pad_matrix(matrix))
+        result = matrix
+        monitor.start(result)
+        propagators = {}
+        while monitor.iterations < max_iterations:
+            steps = min(check_every, max_iterations - monitor.iterations)
+            if self.propagator == 'iterative':
+                self._compute_kernel_fft(matrix.shape)
+                for _ in range(steps):
+                    matrix_fft = matrix_fft * (1 + self._kernel_fft)
+            else:
+                if steps not in propagators:
+                    propagators[steps] = self._compute_propagator(matrix.shape, steps)
+                matrix_fft *= propagators[steps]
+            
+            result = self._unpad_matrix(np.real(ifft2(matrix_fft)), matrix.shape)
+            if monitor.update(result, steps):
+                break
+        
+        # Normalize and verify heat conservation
+        result = self._normalize_matrix(result)
+        final_heat = calculate_total_heat(result)
+        if not np.isclose(self._initial_heat, final_heat, rtol=1e-5):
+            print(f"Warning: Heat conservation violated. Initial: {self._initial_heat:.3f}, Final: {final_heat:.3f}")
+        
+        self.residual_history = monitor.history
+        return result, monitor.iterations
+    
+    def _simulate_frames(self, frames: np.ndarray, iterations: np.ndarray) -> np.ndarray:
+        """Transform the whole stack at once and apply one propagator per frame."""
+        if self.propagator == 'iterative':
+            return super()._simulate_frames(frames, iterations)
+        
+        initial_heat = frames.sum(axis=(1, 2))
+        frame_shape = frames.shape[1:]
+        
+        spectrum = fft2(self._pad_matrix(frames))
+        spectrum *= self._compute_propagator(frame_shape, iterations)
+        result = self._unpad_matrix(np.real(ifft2(spectrum)), frame_shape)
+        
+        result = self._normalize_matrix(result)
+        self._check_batch_heat_conservation(initial_heat, result)
+        return result
\ No newline at end of file
@@ -1,11 +1,198 @@
+import os
+import tempfile
+import multiprocessing
+from multiprocessing import shared_memory
 import numpy as np
-from typing import Tuple
-from .core import HeatSimulation, create_kernel
+from typing import Optional, Tuple
+from .core import HeatSimulation
+
+try:
+    from numba import njit, prange, set_num_threads
+except ImportError:  # Numba is optional, only needed for use_jit=True
+    njit = None
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _stencil_step_jit(current, out, sigma_x, sigma_y):
+        """Fused 5-point stencil step, parallel over rows."""
+        rows, cols = current.shape
+        for i in prange(1, rows - 1):
+            for j in range(1, cols - 1):
+                c = current[i, j]
+                out[i, j] = c + (
+                    sigma_x * (current[i, j + 1] + current[i, j - 1] - 2 * c) +
+                    sigma_y * (current[i + 1, j] + current[i - 1, j] - 2 * c)
+                )
+
+# Stencils the strip-parallel driver can run:
+#   'neumann'   explicit 5-point stencil with edges copied from their neighbours
+#               (FiniteDiffHeatSimulation)
+#   'zero'      explicit 5-point stencil with zero outside the grid (conv_simulation)
+#   'averaging' neighbour averaging (NeighborAveragingHeatSimulation,
+#               funcao_calor_otim_matrix)
+STRIP_STENCILS = ('neumann', 'zero', 'averaging')
+
+def _strip_context():
+    """
+    Start method for the strip workers. Forking a parent that has already
+    started threads (Numba's parallel kernel, BLAS) can deadlock, so the
+    workers are forked from a clean server process that has this module
+    preloaded, or spawned where that is not available. Either way the calling
+    script must guard its entry point with `if __name__ == '__main__':`.
+    """
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    context = multiprocessing.get_context('forkserver')
+    # Only takes effect when the server starts; later calls are no-ops
+    context.set_forkserver_preload([__name__, f'{__package__}.conv_simulation',
+                                    f'{__package__}.heat_simulation'])
+    return context
+
+def strip_worker_count(workers: Optional[int], rows: int) -> int:
+    """Number of strips to use: the requested count (default: CPU count), at most one per two rows."""
+    return min(workers or os.cpu_count() or 1, rows // 2)
+
+def _strip_stepper(stencil: str, params: Tuple[float, float, float, float], use_jit: bool,
+                   shape: Tuple[int, int], row_start: int, row_stop: int):
+    """
+    Build step(current, next_state), which writes rows [row_start, row_stop)
+    of one step of `current` into `next_state`, reading one halo row on each side.
+    """
+    dt, dx, dy, alpha = params
+    if stencil == 'neumann':
+        simulation = FiniteDiffHeatSimulation(*params, use_jit=use_jit)
+        return simulation._strip_stepper(shape, row_start, row_stop)
+    if stencil == 'zero':
+        from .conv_simulation import BLOCK_ROWS, _stencil_rows
+        sigma_x = alpha * dt / dx**2
+        sigma_y = alpha * dt / dy**2
+        block = min(BLOCK_ROWS, row_stop - row_start)
+        delta = np.empty((block, shape[1]))
+        term = np.empty((block, shape[1]))
+        return lambda current, out: _stencil_rows(current, out, row_start, row_stop,
+                                                  sigma_x, sigma_y, delta, term)
+    if stencil == 'averaging':
+        from .heat_simulation import NeighborAveragingHeatSimulation
+        simulation = NeighborAveragingHeatSimulation(*params)
+        count = simulation._neighbor_count(shape)
+        total = np.empty((row_stop - row_start, shape[1]))
+        return lambda current, out: simulation._step_rows(current, out, row_start, row_stop,
+                                                          total, count)
+    raise ValueError(f"Unknown stencil '{stencil}'. Choose one of {STRIP_STENCILS}")
+
+def _run_strip(step, frames, num_iterations: int, barrier) -> None:
+    """
+    Advance one strip of the shared double buffer, in lockstep with the
+    workers owning the other strips.
+    """
+    for n in range(num_iterations):
+        step(frames[n % 2], frames[(n + 1) % 2])
+        # Wait until every strip is done before anyone reads this step
+        barrier.wait()
+
+def _parallel_strip_worker(stencil: str, params: Tuple[float, float, float, float], use_jit: bool,
+                           names: Tuple[str, str], shape: Tuple[int, int],
+                           row_start: int, row_stop: int, num_iterations: int, barrier) -> None:
+    """Process entry point for simulate_strips."""
+    buffers = [shared_memory.SharedMemory(name=name) for name in names]
+    try:
+        if use_jit:
+            # The strips already use one core each
+            set_num_threads(1)
+        frames = [np.ndarray(shape, dtype=np.float64, buffer=buffer.buf) for buffer in buffers]
+        step = _strip_stepper(stencil, params, use_jit, shape, row_start, row_stop)
+        _run_strip(step, frames, num_iterations, barrier)
+    except BaseException:
+        # Release the other workers instead of leaving them waiting forever
+        barrier.abort()
+        raise
+    finally:
+        frames = None
+        for buffer in buffers:
+            buffer.close()
+
+def simulate_strips(matrix: np.ndarray, num_iterations: int, workers: int, stencil: str,
+                    params: Tuple[float, float, float, float], use_jit: bool = False) -> np.ndarray:
+    """
+    Run an explicit stencil on several cores by splitting the grid into horizontal strips.
+    
+    Both state buffers live in shared memory, so each worker reads its
+    neighbours' edge rows (the one-row halo) directly and no frame is ever
+    pickled. A barrier after every step keeps the workers in lockstep. Every
+    row is computed with the same arithmetic as the serial loop, so the result
+    is identical to it. Workers are not forked from the caller (see
+    _strip_context), so scripts must guard their entry point with
+    `if __name__ == '__main__':`.
+    
+    Args:
+        matrix: Initial temperature matrix (2D float64 array), not modified
+        num_iterations: Number of simulation iterations
+        workers: Number of worker processes (strips), at least 2
+        stencil: One of STRIP_STENCILS
+        params: (dt, dx, dy, alpha) of the simulation
+        use_jit: Use the Numba kernel for the 'neumann' stencil
+        
+    Returns:
+        Final temperature matrix (not clipped)
+    """
+    if stencil not in STRIP_STENCILS:
+        raise ValueError(f"Unknown stencil '{stencil}'. Choose one of {STRIP_STENCILS}")
+    rows = matrix.shape[0]
+    context = _strip_context()
+    buffers = [shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1)) for _ in range(2)]
+    frames = None
+    try:
+        frames = [np.ndarray(matrix.shape, dtype=np.float64, buffer=buffer.buf) for buffer in buffers]
+        frames[0][:] = matrix
+        frames[1][:] = matrix
+        
+        barrier = context.Barrier(workers)
+        bounds = np.linspace(0, rows, workers + 1).astype(int)
+        processes = [
+            context.Process(
+                target=_parallel_strip_worker,
+                args=(stencil, tuple(params), use_jit, tuple(buffer.name for buffer in buffers),
+                      matrix.shape, int(bounds[i]), int(bounds[i + 1]), num_iterations, barrier)
+            )
+            for i in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        if any(process.exitcode != 0 for process in processes):
+            raise RuntimeError("A worker process failed during the parallel simulation")
+        
+        result = np.array(frames[num_iterations % 2])
+    finally:
+        frames = None
+        for buffer in buffers:
+            buffer.close()
+            buffer.unlink()
+    
+    return result
 
 class FiniteDiffHeatSimulation(HeatSimulation):
     """Heat simulation using explicit finite difference method."""
     
-    def __init__(self, dt: float, dx: float = 1.0, dy: float = 1.0, alpha: float = 1.0):
+    # Rows processed per block by the NumPy stencil; bounds the scratch memory
+    BLOCK_ROWS = 64
+    
+    def __init__(self, dt: float, dx: float = 1.0, dy: float = 1.0, alpha: float = 1.0,
+                 use_jit: bool = False):
+        """
+        Initialize the explicit finite difference simulation.
+        
+        Args:
+            dt: Time step
+            dx: Spatial step in x direction
+            dy: Spatial step in y direction
+            alpha: Thermal diffusivity coefficient
+            use_jit: Run the stencil as a Numba-compiled, row-parallel kernel
+        """
+        if use_jit and njit is None:
+            raise ImportError("use_jit=True requires numba. Install it with: pip install numba")
+        self.use_jit = use_jit
         super().__init__(dt, dx, dy, alpha)
         self._check_stability()
     
@@ -25,13 +212,73 @@ class FiniteDiffHeatSimulation(HeatSimulation):
         """
         Apply Neumann boundary conditions (zero flux at boundaries).
         This preserves the total heat in the system.
+        Works on a single matrix or on a (B, H, W) stack.
         """
-        matrix[0, :] = matrix[1, :]  # Top boundary
-        matrix[-1, :] = matrix[-2, :]  # Bottom boundary
-        matrix[:, 0] = matrix[:, 1]  # Left boundary
-        matrix[:, -1] = matrix[:, -2]  # Right boundary
+        matrix[..., 0, :] = matrix[..., 1, :]  # Top boundary
+        matrix[..., -1, :] = matrix[..., -2, :]  # Bottom boundary
+        matrix[..., :, 0] = matrix[..., :, 1]  # Left boundary
+        matrix[..., :, -1] = matrix[..., :, -2]  # Right boundary
         return matrix
     
+    def _allocate_work(self, shape: Tuple[int, ...]) -> np.ndarray:
+        """Allocate the scratch rows used by _stencil_step for frames (or stacks) of `shape`."""
+        *lead, rows, cols = shape
+        return np.empty((2, *lead, min(self.BLOCK_ROWS, max(rows - 2, 0)), max(cols - 2, 0)))
+    
+    def _stencil_step(self, current: np.ndarray, out: np.ndarray,
+                      sigma_x: float, sigma_y: float, work: np.ndarray) -> None:
+        """
+        Write one explicit step of `current` into the interior of `out`.
+        
+        The interior is processed in blocks of rows with `out=` ufuncs, so the
+        only scratch memory is `work` (see _allocate_work). Leading stack
+        dimensions are processed together. The operation order matches the
+        plain NumPy expression exactly.
+        """
+        rows = current.shape[-2]
+        for start in range(1, rows - 1, self.BLOCK_ROWS):
+            stop = min(start + self.BLOCK_ROWS, rows - 1)
+            n = stop - start
+            a = work[0, ..., :n, :]
+            b = work[1, ..., :n, :]
+            center = current[..., start:stop, 1:-1]
+            target = out[..., start:stop, 1:-1]
+            
+            # x term: sigma_x * (right + left - 2*center)
+            np.add(current[..., start:stop, 2:], current[..., start:stop, :-2], out=a)
+            np.multiply(center, 2, out=b)
+            np.subtract(a, b, out=a)
+            np.multiply(a, sigma_x, out=a)
+            
+            # y term: sigma_y * (down + up - 2*center), using target as scratch
+            np.add(current[..., start + 1:stop + 1, 1:-1], current[..., start - 1:stop - 1, 1:-1], out=b)
+            np.multiply(center, 2, out=target)
+            np.subtract(b, target, out=b)
+            np.multiply(b, sigma_y, out=b)
+            
+            np.add(a, b, out=a)
+            np.add(center, a, out=target)
+    
+    def _interior_step(self, current: np.ndarray, out: np.ndarray,
+                       sigma_x: float, sigma_y: float, work: Optional[np.ndarray]) -> None:
+        """
+        Write one explicit step of the interior of `current` (a matrix or a
+        (B, H, W) stack) into `out`, with the Numba kernel or the NumPy stencil.
+        
+        Frames with fewer than three rows or columns have no interior, so the
+        step only copies boundaries; `out` receives `current` first so those
+        copies read the current values rather than a stale buffer.
+        """
+        if min(current.shape[-2:]) < 3:
+            np.copyto(out, current)
+        elif not self.use_jit:
+            self._stencil_step(current, out, sigma_x, sigma_y, work)
+        elif current.ndim == 2:
+            _stencil_step_jit(current, out, sigma_x, sigma_y)
+        else:
+            for frame, frame_out in zip(current, out):
+                _stencil_step_jit(frame, frame_out, sigma_x, sigma_y)
+    
     def simulate(self, matrix: np.ndarray, num_iterations: int) -> np.ndarray:
         """
         Run the heat simulation using explicit finite difference method.
@@ -46,27 +293,192 @@ class FiniteDiffHeatSimulation(HeatSimulation):
         self._validate_input_matrix(matrix)
         matrix = self._normalize_matrix(matrix)
         
-        # Calculate diffusion coefficients
+        # Run simulation (the normalized matrix is already a fresh array, so it is reused)
+        current = self._run_steps(np.ascontiguousarray(matrix, dtype=np.float64), num_iterations)
+        
+        return self._normalize_matrix(current)
+    
+    def _run_steps(self, current: np.ndarray, num_iterations: int) -> np.ndarray:
+        """
+        Advance `current` by num_iterations explicit steps with two buffers
+        swapped every step. `current` is reused as one of the buffers.
+        
+        Returns:
+            Final (unclipped) temperature matrix
+        """
         sigma_x = self.alpha * self.dt / self.dx**2
         sigma_y = self.alpha * self.dt / self.dy**2
         
-        # Create kernel for finite difference stencil
-        kernel = create_kernel(sigma_x, sigma_y)
-        
-        # Run simulation
-        current = matrix.copy()
+        next_state = np.empty_like(current)
+        work = None if self.use_jit else self._allocate_work(current.shape)
         for _ in range(num_iterations):
-            # Apply convolution using the finite difference stencil
-            next_state = current.copy()
-            next_state[1:-1, 1:-1] += (
-                sigma_x * (current[1:-1, 2:] + current[1:-1, :-2] - 2*current[1:-1, 1:-1]) +
-                sigma_y * (current[2:, 1:-1] + current[:-2, 1:-1] - 2*current[1:-1, 1:-1])
-            )
+            # Apply the finite difference stencil to the interior
+            self._interior_step(current, next_state, sigma_x, sigma_y, work)
             
             # Apply boundary conditions
-            next_state = self._apply_boundary_conditions(next_state)
+            self._apply_boundary_conditions(next_state)
+            
+            # Swap buffers
+            current, next_state = next_state, current
+        
+        return current
+    
+    def _advance(self, current: np.ndarray, num_iterations: int) -> np.ndarray:
+        """Raw step loop used by simulate_until_steady."""
+        return self._run_steps(current, num_iterations)
+    
+    def simulate_parallel(self, matrix: np.ndarray, num_iterations: int,
+                          workers: Optional[int] = None) -> np.ndarray:
+        """
+        Run the simulation on several cores by splitting the grid into horizontal
+        strips (see simulate_strips). The result is identical to `simulate`.
+        
+        Args:
+            matrix: Initial temperature matrix (2D numpy array)
+            num_iterations: Number of simulation iterations
+            workers: Number of worker processes (defaults to the CPU count)
+            
+        Returns:
+            Final temperature matrix
+        """
+        self._validate_input_matrix(matrix)
+        matrix = self._normalize_matrix(matrix)
+        
+        # Every strip needs at least two rows so the boundary rows stay with their neighbours
+        workers = strip_worker_count(workers, matrix.shape[0])
+        if workers <= 1 or num_iterations == 0:
+            return self.simulate(matrix, num_iterations)
+        
+        result = simulate_strips(np.asarray(matrix, dtype=np.float64), num_iterations, workers,
+                                 'neumann', (self.dt, self.dx, self.dy, self.alpha), self.use_jit)
+        return self._normalize_matrix(result)
+    
+    def _strip_stepper(self, shape: Tuple[int, int], row_start: int, row_stop: int):
+        """
+        Build step(current, next_state) advancing rows [row_start, row_stop) of
+        a shared frame, boundary rows and columns included.
+        """
+        rows = shape[0]
+        sigma_x = self.alpha * self.dt / self.dx**2
+        sigma_y = self.alpha * self.dt / self.dy**2
+        
+        # Own interior rows plus one halo row on each side
+        lo = max(row_start, 1) - 1
+        hi = min(row_stop, rows - 1) + 1
+        work = None if self.use_jit else self._allocate_work((hi - lo, shape[1]))
+        
+        def step(current: np.ndarray, next_state: np.ndarray) -> None:
+            # Apply the finite difference stencil to the interior rows of this strip
+            if shape[1] < 3:
+                # No interior columns: only copy this strip's own rows (see _interior_step)
+                next_state[row_start:row_stop] = current[row_start:row_stop]
+            elif self.use_jit:
+                _stencil_step_jit(current[lo:hi], next_state[lo:hi], sigma_x, sigma_y)
+            else:
+                self._stencil_step(current[lo:hi], next_state[lo:hi], sigma_x, sigma_y, work)
             
-            # Update current state
-            current = next_state
+            # Apply boundary conditions to the rows of this strip, in the same order
+            # as _apply_boundary_conditions
+            if row_start == 0:
+                next_state[0, :] = next_state[1, :]
+            if row_stop == rows:
+                next_state[-1, :] = next_state[-2, :]
+            next_state[row_start:row_stop, 0] = next_state[row_start:row_stop, 1]
+            next_state[row_start:row_stop, -1] = next_state[row_start:row_stop, -2]
+        
+        return step
+    
+    def simulate_out_of_core(self, matrix: np.ndarray, num_iterations: int, out: np.ndarray,
+                             tile_size: int = 1024, steps_per_pass: Optional[int] = None) -> np.ndarray:
+        """
+        Run the simulation tile by tile, for frames that do not fit in memory.
+        
+        Each tile is read with a halo as wide as the number of steps in the pass.
+        The explicit stencil moves information one cell per step, so the tile
+        core comes out exactly as in `simulate`. Peak memory is a few copies of
+        one (tile_size + 2*halo)^2 tile; the halo is at most tile_size, so memory
+        depends on the tile size, not on the frame size or the iteration count.
+        
+        Args:
+            matrix: Initial temperature matrix, typically a numpy.memmap
+            num_iterations: Number of simulation iterations
+            out: Array receiving the result, typically a writable numpy.memmap
+                with the same shape as `matrix`
+            tile_size: Side of the square tile core
+            steps_per_pass: Maximum steps per pass over the frame (the halo
+                width), at most tile_size. Defaults to tile_size // 4; with more
+                than one pass, intermediate states go to a temporary memmap on disk.
+            
+        Returns:
+            `out`
+        """
+        if matrix.ndim != 2 or out.shape != matrix.shape:
+            raise ValueError("Input must be a 2D array and output must have the same shape")
+        if tile_size <= 0:
+            raise ValueError("tile_size must be positive")
+        steps_per_pass = steps_per_pass or max(min(num_iterations, tile_size // 4), 1)
+        if steps_per_pass <= 0:
+            raise ValueError("steps_per_pass must be positive")
+        if steps_per_pass > tile_size:
+            raise ValueError(f"steps_per_pass ({steps_per_pass}) must not exceed tile_size ({tile_size}): "
+                             "the halo would be wider than the tile")
+        
+        passes = []
+        remaining = num_iterations
+        while remaining > 0 or not passes:
+            passes.append(min(steps_per_pass, remaining))
+            remaining -= passes[-1]
+        
+        with tempfile.TemporaryDirectory() as scratch_dir:
+            # Alternate between `out` and a scratch memmap so the last pass writes to `out`
+            scratch = None
+            if len(passes) > 1:
+                scratch = np.lib.format.open_memmap(
+                    os.path.join(scratch_dir, 'scratch.npy'), mode='w+',
+                    dtype=np.float64, shape=matrix.shape
+                )
+            targets = [out if (len(passes) - i) % 2 == 1 else scratch for i in range(len(passes))]
+            
+            source = matrix
+            for index, (steps, target) in enumerate(zip(passes, targets)):
+                first, last = index == 0, index == len(passes) - 1
+                self._tiled_pass(source, target, steps, tile_size, clip_input=first, clip_output=last)
+                source = target
+            
+            if isinstance(out, np.memmap):
+                out.flush()
+            del scratch
+        return out
+    
+    def _tiled_pass(self, source: np.ndarray, target: np.ndarray, steps: int, tile_size: int,
+                    clip_input: bool, clip_output: bool) -> None:
+        """Advance every tile of `source` by `steps` iterations and write the tile cores to `target`."""
+        rows, cols = source.shape
+        halo = steps
+        for row in range(0, rows, tile_size):
+            for col in range(0, cols, tile_size):
+                row_stop, col_stop = min(row + tile_size, rows), min(col + tile_size, cols)
+                r0, r1 = max(row - halo, 0), min(row_stop + halo, rows)
+                c0, c1 = max(col - halo, 0), min(col_stop + halo, cols)
+                
+                tile = np.array(source[r0:r1, c0:c1], dtype=np.float64)
+                self._validate_input_matrix(tile)
+                if clip_input:
+                    tile = self._normalize_matrix(tile)
+                tile = self._run_steps(tile, steps)
+                
+                core = tile[row - r0:row_stop - r0, col - c0:col_stop - c0]
+                target[row:row_stop, col:col_stop] = self._normalize_matrix(core) if clip_output else core
+    
+    def _simulate_frames(self, frames: np.ndarray, iterations: np.ndarray) -> np.ndarray:
+        """Advance all unfinished frames of the stack together, one stencil step at a time."""
+        sigma_x = self.alpha * self.dt / self.dx**2
+        sigma_y = self.alpha * self.dt / self.dy**2
+        work = None if self.use_jit else self._allocate_work(frames.shape)
+        
+        def step(state: np.ndarray, out: np.ndarray) -> None:
+            self._interior_step(state, out, sigma_x, sigma_y,
+                                None if work is None else work[:, -len(state):])
+            self._apply_boundary_conditions(out)
         
-        return self._normalize_matrix(current) 
\ No newline at end of file
+        return self._normalize_matrix(self._iterate_batch(frames, iterations, step))
\ No newline at end of file
@@ -1,25 +1,189 @@
 import numpy as np
+from typing import Optional, Tuple
+from .core import HeatSimulation
+from .finite_diff_simulation import simulate_strips, strip_worker_count
 
-def funcao_calor_otim_matrix(matrix, num_iterations, dt):
+class NeighborAveragingHeatSimulation(HeatSimulation):
+    """
+    Difusão por média dos vizinhos (porte de heat_spread_sim_otim.m):
+    a cada passo, cada pixel se aproxima da média dos seus vizinhos em cruz
+    (4 no interior, 3 nas bordas, 2 nos cantos):
+        novo = atual + alpha*dt * (media_vizinhos - atual)
+    O esquema não usa dx/dy. Com alpha*dt em (0, 1] o novo valor é uma
+    combinação convexa do pixel e dos vizinhos.
+    """
+
+    def __init__(self, dt: float, dx: float = 1.0, dy: float = 1.0, alpha: float = 1.0):
+        """
+        Inicializa a simulação.
+
+        Args:
+            dt: Passo de tempo
+            dx: Passo espacial em x (não usado pelo esquema)
+            dy: Passo espacial em y (não usado pelo esquema)
+            alpha: Coeficiente de difusividade; a taxa de relaxação é alpha*dt
+        """
+        super().__init__(dt, dx, dy, alpha)
+        self.rate = self.alpha * self.dt
+
+    def _neighbor_count(self, shape: Tuple[int, int]) -> np.ndarray:
+        """
+        Número de vizinhos de cada pixel, constante para um formato de matriz,
+        calculado uma vez e compartilhado pelo cache de solvers.
+        """
+        def compute():
+            rows, cols = shape
+            vertical = np.full(rows, 2.0)
+            horizontal = np.full(cols, 2.0)
+            # Separados para que matrizes de uma linha/coluna percam os dois vizinhos
+            vertical[0] -= 1
+            vertical[-1] -= 1
+            horizontal[0] -= 1
+            horizontal[-1] -= 1
+            return vertical[:, None] + horizontal[None, :]
+        return self._cached('averaging', shape, compute)
+
+    def _step(self, current: np.ndarray, out: np.ndarray, total: np.ndarray,
+              count: np.ndarray) -> None:
+        """
+        Escreve um passo de `current` em `out` usando `total` como rascunho.
+        Os vizinhos são somados na ordem (baixo, cima, direita, esquerda),
+        a mesma da versão com np.nansum, então o resultado é idêntico bit a bit.
+        Funciona em uma matriz ou em uma pilha (B, H, W).
+        """
+        # Vizinho de baixo (linha i+1); a última linha não tem
+        total[..., :-1, :] = current[..., 1:, :]
+        total[..., -1, :] = 0.0
+        # Vizinho de cima (linha i-1)
+        total[..., 1:, :] += current[..., :-1, :]
+        # Vizinho da direita (coluna j+1) e da esquerda (coluna j-1)
+        total[..., :, :-1] += current[..., :, 1:]
+        total[..., :, 1:] += current[..., :, :-1]
+
+        # out = current + rate * (total / count - current)
+        np.divide(total, count, out=total)
+        np.subtract(total, current, out=total)
+        np.multiply(total, self.rate, out=total)
+        np.add(current, total, out=out)
+
+    def _step_rows(self, current: np.ndarray, out: np.ndarray, row_start: int, row_stop: int,
+                   total: np.ndarray, count: np.ndarray) -> None:
+        """
+        Escreve em out[row_start:row_stop] as linhas correspondentes de um passo
+        de `current` (matriz 2D), lendo uma linha de halo de cada lado da faixa.
+        A soma dos vizinhos segue a mesma ordem de _step, então o resultado é
+        idêntico bit a bit. `total` tem pelo menos row_stop - row_start linhas.
+        """
+        rows = current.shape[0]
+        t = total[:row_stop - row_start]
+        # Vizinho de baixo (linha i+1); a última linha não tem
+        below_stop = min(row_stop, rows - 1)
+        t[:below_stop - row_start] = current[row_start + 1:below_stop + 1]
+        if row_stop == rows:
+            t[-1] = 0.0
+        # Vizinho de cima (linha i-1); a primeira linha não tem
+        above_start = max(row_start, 1)
+        t[above_start - row_start:] += current[above_start - 1:row_stop - 1]
+        # Vizinho da direita (coluna j+1) e da esquerda (coluna j-1)
+        t[:, :-1] += current[row_start:row_stop, 1:]
+        t[:, 1:] += current[row_start:row_stop, :-1]
+
+        # out = current + rate * (total / count - current)
+        np.divide(t, count[row_start:row_stop], out=t)
+        np.subtract(t, current[row_start:row_stop], out=t)
+        np.multiply(t, self.rate, out=t)
+        np.add(current[row_start:row_stop], t, out=out[row_start:row_stop])
+
+    def simulate(self, matrix: np.ndarray, num_iterations: int) -> np.ndarray:
+        """
+        Executa a simulação por média dos vizinhos.
+
+        Args:
+            matrix: Matriz 2D de temperatura inicial
+            num_iterations: Número de iterações
+
+        Returns:
+            Matriz 2D de temperatura final
+        """
+        self._validate_input_matrix(matrix)
+        matrix = self._normalize_matrix(matrix)
+        current = self._run_steps(np.array(matrix, dtype=np.float64), num_iterations)
+        return self._normalize_matrix(current)
+
+    def simulate_parallel(self, matrix: np.ndarray, num_iterations: int,
+                          workers: Optional[int] = None) -> np.ndarray:
+        """
+        Executa a simulação em vários núcleos, com a matriz dividida em faixas
+        de linhas (ver finite_diff_simulation.simulate_strips). O resultado é
+        idêntico ao de simulate.
+
+        Args:
+            matrix: Matriz 2D de temperatura inicial
+            num_iterations: Número de iterações
+            workers: Número de processos (padrão: número de núcleos)
+
+        Returns:
+            Matriz 2D de temperatura final
+        """
+        self._validate_input_matrix(matrix)
+        matrix = self._normalize_matrix(matrix)
+        current = self._run_parallel(np.array(matrix, dtype=np.float64), num_iterations, workers)
+        return self._normalize_matrix(current)
+
+    def _run_parallel(self, current: np.ndarray, num_iterations: int,
+                      workers: Optional[int]) -> np.ndarray:
+        """Como _run_steps, mas dividido em faixas quando há mais de um processo."""
+        workers = strip_worker_count(workers, current.shape[0])
+        if workers <= 1 or num_iterations == 0:
+            return self._run_steps(current, num_iterations)
+        return simulate_strips(current, num_iterations, workers, 'averaging',
+                               (self.dt, self.dx, self.dy, self.alpha))
+
+    def _run_steps(self, current: np.ndarray, num_iterations: int) -> np.ndarray:
+        """
+        Avança `current` por num_iterations passos com dois buffers trocados a
+        cada passo; `current` é reaproveitado como um deles.
+
+        Returns:
+            Matriz final (sem normalização)
+        """
+        count = self._neighbor_count(current.shape)
+        next_state = np.empty_like(current)
+        total = np.empty_like(current)
+        for _ in range(num_iterations):
+            self._step(current, next_state, total, count)
+            current, next_state = next_state, current
+        return current
+
+    def _advance(self, current: np.ndarray, num_iterations: int) -> np.ndarray:
+        """Laço de passos usado por simulate_until_steady."""
+        return self._run_steps(current, num_iterations)
+
+    def _simulate_frames(self, frames: np.ndarray, iterations: np.ndarray) -> np.ndarray:
+        """Avança juntos todos os quadros da pilha que ainda não terminaram."""
+        count = self._neighbor_count(frames.shape[1:])
+        total = np.empty_like(frames)
+
+        def step(state: np.ndarray, out: np.ndarray) -> None:
+            self._step(state, out, total[-len(state):], count)
+
+        return self._normalize_matrix(self._iterate_batch(frames, iterations, step))
+
+def funcao_calor_otim_matrix(matrix, num_iterations, dt, workers=1):
     """
     Aplica o método explícito para a simulação do calor em uma matriz.
     usando diferença de matrizes.
-    
+
+    Mantida para pipelines legados; delega para NeighborAveragingHeatSimulation,
+    sem normalizar a entrada nem a saída.
+
     :param matriz: Matriz 2D de temperatura inicial (normalizada entre 0 e 1).
     :param num_iteração: Quantas interações devem ser feitas.
     :param dt: .
+    :param workers: Processos que dividem a matriz em faixas de linhas em
+        memória compartilhada (None usa todos os núcleos); o resultado é o
+        mesmo com qualquer valor.
     :return: Matriz 2D de temperatura final.
     """
-    rows, cols = matrix.shape
-    for _ in range(num_iterations):
-        matrix_up = np.vstack([matrix[1:, :], np.full((1, cols), np.nan)])
-        matrix_down = np.vstack([np.full((1, cols), np.nan), matrix[:-1, :]])
-        matrix_left = np.hstack([matrix[:, 1:], np.full((rows, 1), np.nan)])
-        matrix_right = np.hstack([np.full((rows, 1), np.nan), matrix[:, :-1]])
-        
-        sum_neighbors = np.nansum(np.stack([matrix_up, matrix_down, matrix_left, matrix_right], axis=0), axis=0)
-        num_neighbors = np.sum(~np.isnan(np.stack([matrix_up, matrix_down, matrix_left, matrix_right], axis=0)), axis=0)
-        
-        new_matrix = matrix + dt * (sum_neighbors / num_neighbors - matrix)
-        matrix = new_matrix
-    return matrix
+    simulation = NeighborAveragingHeatSimulation(dt)
+    return simulation._run_parallel(np.array(matrix, dtype=np.float64), num_iterations, workers)
@@ -1,12 +1,15 @@
 import numpy as np
 from scipy.sparse import diags
-from scipy.sparse.linalg import spsolve
+from .adi_simulation import fatorar_matriz_tridiagonal, resolver_em_lote
+from .core import integrate_adaptive
+
+ESQUEMAS = ('implicito', 'crank_nicolson')
 
 
 def construir_matriz_tridiagonal(n, sigma):
     """
     Constrói uma matriz tridiagonal esparsa para o método implícito.
-    
+
     :param n: Número de pontos na direção (x ou y).
     :param sigma: Fator de difusão em uma direção (x ou y).
     :return: Matriz tridiagonal esparsa no formato CSR.
@@ -22,33 +25,66 @@ def construir_matriz_tridiagonal(n, sigma):
 def resolver_direcao_alternada(U, A, axis):
     """
     Resolve o sistema linear em uma direção (x ou y) usando o método implícito.
-    
+    Todas as linhas (ou colunas) são resolvidas de uma vez, com uma única
+    fatoração L*D*L^T da matriz tridiagonal.
+
     :param U: Matriz de temperatura atual.
-    :param A: Matriz tridiagonal esparsa correspondente à direção.
-    :param axis: 0 para resolver ao longo de x, 1 para resolver ao longo de y.
+    :param A: Matriz tridiagonal esparsa correspondente à direção, ou seus fatores
+              (d, e) já calculados por fatorar_matriz_tridiagonal.
+    :param axis: 0 para resolver ao longo das colunas, 1 para resolver ao longo das linhas.
     :return: Matriz U atualizada.
     """
-    if axis == 0:  # Resolver ao longo de x (linhas)
-        for j in range(U.shape[1]):
-            U[:, j] = spsolve(A, U[:, j])
-    elif axis == 1:  # Resolver ao longo de y (colunas)
-        for i in range(U.shape[0]):
-            U[i, :] = spsolve(A, U[i, :])
+    fatores = A if isinstance(A, tuple) else fatorar_matriz_tridiagonal(A)
+    if axis == 0:  # Cada coluna é um lado direito
+        U[:, :] = resolver_em_lote(fatores, U)
+    elif axis == 1:  # Cada linha é um lado direito (U.T já está em ordem de colunas)
+        U[:, :] = resolver_em_lote(fatores, U.T).T
     return U
 
 
-def metodo_implicito(U_inicial, alpha, dt, Tf, Lx, Ly):
+def aplicar_parte_explicita(U, sigma, axis):
+    """
+    Aplica a metade explícita do Crank–Nicolson, (I + sigma/2 * T) U, com
+    T = tridiag(1, -2, 1) ao longo do eixo dado e vizinhos nulos fora da matriz
+    (a mesma borda das matrizes implícitas).
+
+    :param U: Matriz de temperatura atual.
+    :param sigma: Fator de difusão na direção.
+    :param axis: 0 ao longo das colunas, 1 ao longo das linhas.
+    :return: Nova matriz com o resultado.
+    """
+    V = np.moveaxis(U, axis, 0)
+    R = (1 - sigma) * V
+    R[1:] += 0.5 * sigma * V[:-1]
+    R[:-1] += 0.5 * sigma * V[1:]
+    return np.moveaxis(R, 0, axis)
+
+
+def metodo_implicito(U_inicial, alpha, dt, Tf, Lx, Ly, esquema='implicito', tolerancia=None):
     """
     Executa a simulação de calor usando o método implícito.
-    
+
+    Os dois esquemas são incondicionalmente estáveis, então dt não precisa
+    respeitar sigma_x + sigma_y <= 0.5; ele só controla a precisão.
+
     :param U_inicial: Matriz 2D de temperatura inicial (normalizada entre 0 e 1).
     :param alpha: Difusividade térmica.
-    :param dt: Intervalo de tempo.
+    :param dt: Intervalo de tempo (passo inicial quando há tolerancia).
     :param Tf: Tempo total de simulação.
     :param Lx: Comprimento físico na direção x.
     :param Ly: Comprimento físico na direção y.
+    :param esquema: 'implicito' (Euler implícito em cada direção, 1ª ordem no
+                    tempo) ou 'crank_nicolson' (2ª ordem no tempo).
+    :param tolerancia: Se dada, o passo é adaptativo: cada passo é comparado
+                       com dois meios passos e o erro local (norma do máximo)
+                       fica abaixo de tolerancia, com passos dt * 2**k e a
+                       simulação terminando exatamente em Tf. Sem tolerancia,
+                       são int(Tf / dt) passos fixos.
     :return: Matriz 2D de temperatura final.
     """
+    if esquema not in ESQUEMAS:
+        raise ValueError(f"Esquema desconhecido '{esquema}'. Use um de {ESQUEMAS}")
+
     # Obter dimensões da matriz inicial
     ny, nx = U_inicial.shape
 
@@ -56,27 +92,50 @@ def metodo_implicito(U_inicial, alpha, dt, Tf, Lx, Ly):
     dx = Lx / (nx - 1)
     dy = Ly / (ny - 1)
 
-    # Calcular os sigmas (fatores de difusão)
-    sigma_x = alpha * dt / dx**2
-    sigma_y = alpha * dt / dy**2
+    # No Crank–Nicolson a parte implícita usa metade do fator de difusão
+    crank_nicolson = esquema == 'crank_nicolson'
+    fator = 0.5 if crank_nicolson else 1.0
+
+    # Matrizes tridiagonais fatoradas uma única vez por passo de tempo. As
+    # colunas variam em y (ny pontos) e as linhas em x (nx pontos).
+    fatores_por_passo = {}
 
-    # Verificar condição de estabilidade
-    if sigma_x + sigma_y > 0.5:
-        raise ValueError("Condição de estabilidade violada! Reduza dt ou aumente dx/dy.")
+    def fatores(h):
+        if h not in fatores_por_passo:
+            sigma_x = alpha * h / dx**2
+            sigma_y = alpha * h / dy**2
+            fatores_por_passo[h] = (
+                sigma_x, sigma_y,
+                fatorar_matriz_tridiagonal(construir_matriz_tridiagonal(nx, fator * sigma_x)),
+                fatorar_matriz_tridiagonal(construir_matriz_tridiagonal(ny, fator * sigma_y)),
+            )
+        return fatores_por_passo[h]
 
-    # Construir as matrizes tridiagonais
-    A_x = construir_matriz_tridiagonal(nx, sigma_x)
-    A_y = construir_matriz_tridiagonal(ny, sigma_y)
+    def avancar(U, h):
+        """Avança U (modificada no lugar quando possível) por um passo h."""
+        sigma_x, sigma_y, fatores_x, fatores_y = fatores(h)
+        if crank_nicolson:
+            U = aplicar_parte_explicita(U, sigma_y, axis=0)
+        U = resolver_direcao_alternada(U, fatores_y, axis=0)  # Passo 1: resolver ao longo das colunas (y)
+        if crank_nicolson:
+            U = aplicar_parte_explicita(U, sigma_x, axis=1)
+        return resolver_direcao_alternada(U, fatores_x, axis=1)  # Passo 2: resolver ao longo das linhas (x)
 
     # Inicializar o campo de temperatura
-    U = U_inicial.copy()
+    U = np.array(U_inicial, dtype=np.float64)
+
+    if tolerancia is not None:
+        # Com borda nula os operadores em x e em y comutam, então a divisão em
+        # direções não reduz a ordem do Crank–Nicolson
+        U, _, _ = integrate_adaptive(U, Tf, dt, lambda V, h: avancar(V.copy(), h),
+                                     order=2 if crank_nicolson else 1, tolerance=tolerancia)
+        return U
 
     # Número de passos de tempo
     nT = int(Tf / dt)
 
     # Iterações no tempo
     for _ in range(nT):
-        U = resolver_direcao_alternada(U, A_x, axis=0)  # Passo 1: resolver ao longo de x
-        U = resolver_direcao_alternada(U, A_y, axis=1)  # Passo 2: resolver ao longo de y
+        U = avancar(U, dt)
 
     return U
@@ -8,6 +8,7 @@ from PIL import Image
 from scipy.linalg import svd, solve_sylvester
 import matplotlib.pyplot as plt
 from utils import normalize_image, mse, psnr
+from sylvester import resultant_matrix
 
 # Caminhos
 base_dir = Path(__file__).parent.parent
@@ -29,20 +30,7 @@ linha1 = img_blur[h//2 - 1, :grau_kernel]
 linha2 = img_blur[h//2 + 1, :grau_kernel]
 
 # 3. Matriz de Sylvester
-m = len(linha1) - 1
-n = len(linha2) - 1
-size = m + n
-F = np.pad(linha1, (0, size - m), 'constant')
-G = np.pad(linha2, (0, size - n), 'constant')
-S = np.zeros((size, size))
-for k in range(n):
-    end = k + m + 1
-    if end <= size and (end - k) == len(F):
-        S[k, k:end] = F
-for k in range(m):
-    end = k + n + 1
-    if end <= size and (end - k) == len(G):
-        S[n+k, k:end] = G
+S = resultant_matrix(linha1, linha2)
 U, s, Vh = svd(S)
 psf_1d_est = Vh[-1, :grau_kernel]
 if np.sum(psf_1d_est) != 0:
@@ -1,7 +1,12 @@
 import numpy as np
-from scipy.linalg import solve_sylvester, svd
-from typing import Tuple, Optional
+from scipy.linalg import solve_sylvester, svd, get_lapack_funcs
+from scipy.fft import rfft2, irfft2, next_fast_len
+from scipy.sparse.linalg import svds
+from typing import Tuple, Optional, Sequence
 from dataclasses import dataclass
+from . import metrics
+from .sylvester import sylvester_matrix, SylvesterOperator
+from .psf_estimation import AGGREGATIONS, estimate_1d_psf_batch, select_line_pairs
 
 @dataclass
 class DeconvolutionResult:
@@ -11,6 +16,24 @@ class DeconvolutionResult:
     psnr: float
     ssim: float
     mse: float
+    iterations: Optional[int] = None
+
+@dataclass
+class RegularizationPath:
+    """
+    Restorations over a grid of regularization parameters of the 'wiener'
+    solver: lambda is added to |H|^2, so best_lambda applies to
+    BlindDeconvolution(solver='wiener', regularization=best_lambda).
+    """
+    lambdas: np.ndarray
+    residual_norms: np.ndarray
+    solution_norms: np.ndarray
+    gcv: np.ndarray
+    criterion: str
+    best_index: int
+    best_lambda: float
+    result: DeconvolutionResult
+    restorations: Optional[np.ndarray] = None
 
 class BlindDeconvolution:
     """
@@ -18,15 +41,60 @@ class BlindDeconvolution:
     conforme o artigo de Winkler (The Sylvester resultant matrix and image).
     """
     
-    def __init__(self, max_psf_size: int = 15, regularization: float = 1e-6):
+    SOLVERS = ('banded', 'dense', 'wiener')
+    SVD_MODES = ('full', 'partial')
+    CRITERIA = ('gcv', 'lcurve')
+    
+    def __init__(self, max_psf_size: int = 15, regularization: float = 1e-6, solver: str = 'banded',
+                 num_pairs: int = 1, aggregate: str = 'median', workers: int = 1,
+                 svd_mode: str = 'full', pyramid_levels: int = 0, refine_window: int = 2):
         """
         Inicializa o resolvedor de deconvolução cega.
         max_psf_size: Tamanho máximo do PSF a ser estimado
         regularization: Parâmetro de regularização para estabilidade numérica
+        solver: 'banded' explora a estrutura Toeplitz triangular em banda das
+                matrizes (O(h*w*psf), sem matrizes densas); 'dense' monta H_x/H_y
+                e usa scipy.linalg.solve_sylvester (Bartels-Stewart, O(n^3));
+                'wiener' divide pela função de transferência do PSF no domínio da
+                frequência com regularização de Tikhonov (O(N log N))
+        num_pairs: Número de pares de linhas/colunas usados na estimativa do PSF;
+                com mais de um par a estimativa é feita em lote e agregada
+        aggregate: Agregação robusta das estimativas por par ('median' ou 'consensus')
+        workers: Processos usados para decompor os pares em paralelo (com mais de
+                 um, o script precisa de `if __name__ == '__main__':`)
+        svd_mode: 'full' decompõe toda a matriz de Sylvester; 'partial' calcula só
+                os max_psf_size+1 maiores valores singulares (svds sobre a forma
+                implícita da matriz) e procura o joelho nesse espectro truncado,
+                limitando o grau a max_psf_size
+        pyramid_levels: Níveis de redução por 2 da estimativa multirresolução
+                (0 desativa); o grau e o PSF são estimados no nível mais grosso
+                e refinados nos mais finos. Só vale para a estimativa com um par
+                (num_pairs=1); combiná-lo com num_pairs > 1 gera ValueError
+        refine_window: Meia largura da janela de graus pesquisada em cada nível
+                fino, em torno do dobro do grau do nível anterior
         """
+        if solver not in self.SOLVERS:
+            raise ValueError(f"Solver desconhecido '{solver}'. Use um de {self.SOLVERS}")
+        if aggregate not in AGGREGATIONS:
+            raise ValueError(f"Agregação desconhecida '{aggregate}'. Use uma de {AGGREGATIONS}")
+        if svd_mode not in self.SVD_MODES:
+            raise ValueError(f"Modo de SVD desconhecido '{svd_mode}'. Use um de {self.SVD_MODES}")
+        if pyramid_levels > 0 and num_pairs > 1:
+            raise ValueError("pyramid_levels só se aplica à estimativa com um par; "
+                             "use num_pairs=1 ou pyramid_levels=0")
         self.max_psf_size = max_psf_size
         self.regularization = regularization
+        self.solver = solver
+        self.num_pairs = num_pairs
+        self.aggregate = aggregate
+        self.workers = workers
+        self.svd_mode = svd_mode
+        self.pyramid_levels = pyramid_levels
+        self.refine_window = refine_window
         self._estimated_psf = None
+        # Espectros do PSF por formato de FFT, válidos para o PSF em _psf_spectra_source
+        self._psf_spectra = {}
+        self._psf_spectra_source = None
     
     def _build_sylvester_matrix(self, row1: np.ndarray, row2: np.ndarray, degree: int) -> np.ndarray:
         """
@@ -34,15 +102,7 @@ class BlindDeconvolution:
         Cada linha representa os coeficientes de um polinômio associado à imagem borrada.
         degree: grau estimado do PSF.
         """
-        n = len(row1)
-        S = np.zeros((2*n-degree, 2*n-degree))
-        # Preenche o bloco superior com row1
-        for i in range(n-degree):
-            S[i:i+n, i] = row1
-        # Preenche o bloco inferior com row2
-        for i in range(n-degree):
-            S[i:i+n, n-degree+i] = row2
-        return S
+        return sylvester_matrix(row1, row2, degree)
     
     def _estimate_psf_degree(self, S: np.ndarray) -> int:
         """
@@ -50,27 +110,115 @@ class BlindDeconvolution:
         O ponto de "joelho" indica o grau mais provável.
         """
         _, s, _ = svd(S)
+        return self._knee_point(s)
+    
+    @staticmethod
+    def _knee_point(s: np.ndarray) -> int:
+        """
+        Ponto de "joelho" de um espectro singular em ordem decrescente.
+        """
         s_normalized = s / s[0]
         diff = np.diff(s_normalized)
-        knee_point = np.argmax(diff) + 1
-        return knee_point
+        return int(np.argmax(diff)) + 1
+    
+    def _leading_singular_triplets(self, row1: np.ndarray, row2: np.ndarray, k: int,
+                                   degree: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calcula os k maiores valores singulares da matriz de Sylvester e os
+        vetores singulares à direita correspondentes, em ordem decrescente, com
+        svds (ARPACK) sobre SylvesterOperator, sem montar a matriz.
+        Matrizes pequenas demais para o ARPACK usam a SVD completa.
+        degree: grau usado na montagem da matriz (padrão: max_psf_size)
+        """
+        degree = self.max_psf_size if degree is None else degree
+        operator = SylvesterOperator(row1, row2, degree)
+        size = operator.shape[0]
+        if k >= size - 1:
+            _, s, vh = svd(sylvester_matrix(row1, row2, degree))
+            return s[:k], vh[:k]
+        # Vetor inicial fixo para resultados reprodutíveis
+        v0 = np.full(size, 1 / np.sqrt(size))
+        _, s, vh = svds(operator, k=k, v0=v0)
+        order = np.argsort(s)[::-1]
+        return s[order], vh[order]
     
     def _estimate_1d_psf(self, image: np.ndarray, axis: int = 0) -> np.ndarray:
         """
         Estima o PSF 1D ao longo de um eixo (linhas ou colunas) usando equações de Sylvester.
-        Usa as duas primeiras linhas/colunas da imagem borrada.
+        Usa as duas primeiras linhas/colunas da imagem borrada, ou num_pairs
+        pares distribuídos pela imagem quando num_pairs > 1.
         """
+        if self.num_pairs > 1:
+            first, second = select_line_pairs(image, axis, self.num_pairs)
+            return estimate_1d_psf_batch(first, second, self.max_psf_size,
+                                         aggregate=self.aggregate, workers=self.workers)
         if axis == 0:
             rows = [image[i, :] for i in range(min(2, image.shape[0]))]
         else:
             rows = [image[:, i] for i in range(min(2, image.shape[1]))]
-        S = self._build_sylvester_matrix(rows[0], rows[1], self.max_psf_size)
-        degree = self._estimate_psf_degree(S)
-        # Resolve a equação de Sylvester via SVD
-        _, s, vh = svd(S)
+        if self.pyramid_levels > 0:
+            return self._estimate_1d_psf_pyramid(rows[0], rows[1])
+        if self.svd_mode == 'partial':
+            s, vh = self._leading_singular_triplets(rows[0], rows[1], self.max_psf_size + 1)
+        else:
+            S = self._build_sylvester_matrix(rows[0], rows[1], self.max_psf_size)
+            _, s, vh = svd(S)
+        # Uma única decomposição fornece o grau (joelho do espectro) e o PSF
+        degree = self._knee_point(s)
         psf = vh[degree-1, :degree]
         return psf / np.sum(psf)  # Normaliza o PSF
     
+    def _estimate_1d_psf_pyramid(self, row1: np.ndarray, row2: np.ndarray) -> np.ndarray:
+        """
+        Estimativa multirresolução do PSF 1D a partir de um par de linhas.
+        1. Reduz o par por média de pixels vizinhos, pyramid_levels vezes (ou
+           enquanto as linhas comportarem o PSF reduzido).
+        2. No nível mais grosso, procura o joelho entre os max_psf_size/2^L + 1
+           maiores valores singulares.
+        3. Em cada nível mais fino, o suporte do PSF dobra: calcula só os valores
+           singulares até 2*grau + refine_window e procura o joelho na janela
+           [2*grau - refine_window, 2*grau + refine_window]. O PSF do nível é o
+           vetor singular correspondente; se ele for degenerado (soma nula), usa
+           a estimativa do nível anterior interpolada.
+        Apenas o nível mais grosso varre todos os graus, e ele é 2^L vezes menor.
+        """
+        pyramid = [(np.asarray(row1, dtype=np.float64), np.asarray(row2, dtype=np.float64))]
+        max_sizes = [self.max_psf_size]
+        while len(pyramid) <= self.pyramid_levels:
+            first, second = pyramid[-1]
+            half = len(first) // 2
+            max_size = max(-(-max_sizes[-1] // 2), 1)
+            if half < 2 * max_size + 2:
+                break
+            pyramid.append((first[:2 * half].reshape(half, 2).mean(axis=1),
+                            second[:2 * half].reshape(half, 2).mean(axis=1)))
+            max_sizes.append(max_size)
+        
+        # Nível mais grosso: busca completa do grau
+        first, second = pyramid[-1]
+        s, vh = self._leading_singular_triplets(first, second, max_sizes[-1] + 1, degree=max_sizes[-1])
+        degree = self._knee_point(s)
+        psf = vh[degree - 1, :degree]
+        psf = psf / np.sum(psf)
+        
+        # Níveis mais finos: refinamento numa janela estreita de graus
+        for (first, second), max_size in zip(pyramid[-2::-1], max_sizes[-2::-1]):
+            center = 2 * degree
+            low = min(max(center - self.refine_window, 1), max_size)
+            high = min(center + self.refine_window, max_size)
+            s, vh = self._leading_singular_triplets(first, second, high + 1, degree=max_size)
+            diff = np.diff(s[:high + 1] / s[0])
+            coarse = psf
+            degree = low + int(np.argmax(diff[low - 1:high]))
+            psf = vh[degree - 1, :degree]
+            total = np.sum(psf)
+            if abs(total) > np.finfo(float).eps:
+                psf = psf / total
+            else:
+                psf = np.interp(np.linspace(0, len(coarse) - 1, degree), np.arange(len(coarse)), coarse)
+                psf = psf / np.sum(psf)
+        return psf
+    
     def estimate_psf(self, blurred_image: np.ndarray) -> np.ndarray:
         """
         Estima o PSF 2D separável a partir da imagem borrada.
@@ -92,6 +240,132 @@ class BlindDeconvolution:
         """
         if self._estimated_psf is None:
             self.estimate_psf(blurred_image)
+        if self.solver == 'banded':
+            restored = self._solve_sylvester_banded(blurred_image)
+        elif self.solver == 'wiener':
+            restored = self._solve_wiener(blurred_image)
+        else:
+            restored = self._solve_sylvester_dense(blurred_image)
+        return self._make_result(blurred_image, restored)
+    
+    def _make_result(self, blurred_image: np.ndarray, restored: np.ndarray) -> DeconvolutionResult:
+        """Calcula as métricas de qualidade e monta o resultado."""
+        return DeconvolutionResult(
+            restored_image=restored,
+            estimated_psf=self._estimated_psf,
+            psnr=float(metrics.psnr(blurred_image, restored)),
+            ssim=float(metrics.ssim(blurred_image, restored)),
+            mse=float(metrics.mse(blurred_image, restored))
+        )
+    
+    def deconvolve_path(self, blurred_image: np.ndarray, lambdas: Sequence[float],
+                        criterion: str = 'gcv', return_all: bool = False) -> RegularizationPath:
+        """
+        Restaura a imagem para uma grade de parâmetros de regularização e escolhe
+        o melhor por validação cruzada generalizada (GCV) ou pelo canto da curva L.
+        
+        A família avaliada é a restauração de Tikhonov do solver 'wiener',
+            X(lambda) = conj(H) B / (|H|^2 + lambda),
+        pois a FFT diagonaliza o operador de convolução: o PSF e a imagem são
+        transformados uma única vez e cada lambda custa apenas operações
+        elemento a elemento no espectro. As normas do resíduo e da solução e o
+        traço da matriz de influência saem do espectro (Parseval), sem FFT
+        inversa (a norma da solução exclui a média da imagem); só a
+        restauração escolhida (ou todas, com return_all) é transformada de
+        volta. As matrizes Toeplitz triangulares do modelo de
+        Sylvester têm um único autovalor repetido e não são diagonalizáveis,
+        por isso o caminho não usa os solvers 'banded'/'dense' e exige
+        solver='wiener': lá lambda soma-se à diagonal de H_x e H_y, e o lambda
+        escolhido aqui não valeria para eles.
+        
+        lambdas: Parâmetros de regularização (positivos); a grade é ordenada
+        criterion: 'gcv' (mínimo da função GCV) ou 'lcurve' (máxima curvatura da
+                   curva log(resíduo) x log(norma da solução), exige 3 ou mais lambdas)
+        return_all: Se True, inclui a pilha (K, h, w) de todas as restaurações
+        """
+        if self.solver != 'wiener':
+            raise ValueError(f"deconvolve_path avalia o modelo 'wiener'; o solver configurado é "
+                             f"'{self.solver}'. Use BlindDeconvolution(solver='wiener')")
+        if criterion not in self.CRITERIA:
+            raise ValueError(f"Critério desconhecido '{criterion}'. Use um de {self.CRITERIA}")
+        lambdas = np.sort(np.asarray(lambdas, dtype=np.float64).ravel())
+        if lambdas.size == 0 or np.any(lambdas <= 0):
+            raise ValueError("lambdas deve conter valores positivos")
+        if criterion == 'lcurve' and lambdas.size < 3:
+            raise ValueError("O critério da curva L exige pelo menos 3 valores de lambda")
+        
+        if self._estimated_psf is None:
+            self.estimate_psf(blurred_image)
+        h, w = blurred_image.shape
+        shape, observed, H = self._wiener_spectra(blurred_image)
+        power = np.abs(H) ** 2
+        num_pixels = shape[0] * shape[1]
+        # Pesos de Parseval da FFT real: colunas com par conjugado contam duas vezes
+        weights = np.full(H.shape[1], 2.0)
+        weights[0] = 1.0
+        if shape[1] % 2 == 0:
+            weights[-1] = 1.0
+        observed_energy = np.abs(observed) ** 2 * weights
+        backprojected_energy = power * observed_energy
+        # A norma da solução ignora a média da imagem (termo DC), que domina
+        # ||x|| e apagaria o canto da curva L
+        backprojected_energy[0, 0] = 0.0
+        
+        residual_norms = np.empty(lambdas.size)
+        solution_norms = np.empty(lambdas.size)
+        gcv = np.empty(lambdas.size)
+        for i, lam in enumerate(lambdas):
+            complement = lam / (power + lam)  # 1 - fator de filtro
+            residual_sq = np.sum(complement ** 2 * observed_energy) / num_pixels
+            residual_norms[i] = np.sqrt(residual_sq)
+            solution_norms[i] = np.sqrt(np.sum(backprojected_energy / (power + lam) ** 2) / num_pixels)
+            trace = np.sum(complement * weights)
+            gcv[i] = num_pixels * residual_sq / trace ** 2
+        
+        if criterion == 'gcv':
+            best = int(np.argmin(gcv))
+        else:
+            best = self._lcurve_corner(lambdas, residual_norms, solution_norms)
+        
+        def restore(lam: float) -> np.ndarray:
+            return irfft2(np.conj(H) * observed / (power + lam), s=shape)[:h, :w]
+        
+        restorations = np.stack([restore(lam) for lam in lambdas]) if return_all else None
+        restored = restorations[best] if return_all else restore(lambdas[best])
+        return RegularizationPath(
+            lambdas=lambdas,
+            residual_norms=residual_norms,
+            solution_norms=solution_norms,
+            gcv=gcv,
+            criterion=criterion,
+            best_index=best,
+            best_lambda=float(lambdas[best]),
+            result=self._make_result(blurred_image, restored),
+            restorations=restorations
+        )
+    
+    @staticmethod
+    def _lcurve_corner(lambdas: np.ndarray, residual_norms: np.ndarray,
+                       solution_norms: np.ndarray) -> int:
+        """
+        Índice do canto da curva L: ponto de máxima curvatura de
+        (log ||resíduo||, log ||solução||) parametrizada por log(lambda).
+        As extremidades da grade, onde as diferenças finitas são unilaterais,
+        não são candidatas.
+        """
+        t = np.log(lambdas)
+        rho = np.log(residual_norms)
+        eta = np.log(solution_norms)
+        drho, deta = np.gradient(rho, t), np.gradient(eta, t)
+        d2rho, d2eta = np.gradient(drho, t), np.gradient(deta, t)
+        curvature = (drho * d2eta - d2rho * deta) / (drho ** 2 + deta ** 2 + 1e-300) ** 1.5
+        return int(np.argmax(curvature[1:-1])) + 1
+    
+    def _solve_sylvester_dense(self, blurred_image: np.ndarray) -> np.ndarray:
+        """
+        Monta as matrizes Toeplitz densas e resolve H_y X + X H_x = imagem_borrada
+        com scipy.linalg.solve_sylvester.
+        """
         h, w = blurred_image.shape
         psf_h, psf_w = self._estimated_psf.shape
         # Monta matrizes Toeplitz para cada dimensão
@@ -105,35 +379,73 @@ class BlindDeconvolution:
         H_x += self.regularization * np.eye(w)
         H_y += self.regularization * np.eye(h)
         # Resolve a equação de Sylvester: H_y X + X H_x = imagem_borrada
-        restored = solve_sylvester(H_y, H_x, blurred_image)
-        # Calcula métricas
-        mse = np.mean((blurred_image - restored) ** 2)
-        psnr = 10 * np.log10(1.0 / mse)
-        ssim = self._calculate_ssim(blurred_image, restored)
-        return DeconvolutionResult(
-            restored_image=restored,
-            estimated_psf=self._estimated_psf,
-            psnr=psnr,
-            ssim=ssim,
-            mse=mse
-        )
+        return solve_sylvester(H_y, H_x, blurred_image)
     
-    def _calculate_ssim(self, img1: np.ndarray, img2: np.ndarray) -> float:
-        """
-        Calcula o índice de similaridade estrutural (SSIM) entre duas imagens.
-        """
-        C1 = (0.01 * 255) ** 2
-        C2 = (0.03 * 255) ** 2
-        img1 = img1.astype(np.float64)
-        img2 = img2.astype(np.float64)
-        kernel = np.ones((11, 11)) / 121
-        mu1 = np.convolve(img1.flatten(), kernel.flatten(), mode='valid')
-        mu2 = np.convolve(img2.flatten(), kernel.flatten(), mode='valid')
-        mu1_sq = mu1 ** 2
-        mu2_sq = mu2 ** 2
-        mu1_mu2 = mu1 * mu2
-        sigma1_sq = np.convolve(img1.flatten() ** 2, kernel.flatten(), mode='valid') - mu1_sq
-        sigma2_sq = np.convolve(img2.flatten() ** 2, kernel.flatten(), mode='valid') - mu2_sq
-        sigma12 = np.convolve(img1.flatten() * img2.flatten(), kernel.flatten(), mode='valid') - mu1_mu2
-        ssim_map = ((2 * mu1_mu2 + C1) * (2 * sigma12 + C2)) / ((mu1_sq + mu2_sq + C1) * (sigma1_sq + sigma2_sq + C2))
-        return np.mean(ssim_map) 
\ No newline at end of file
+    def _solve_sylvester_banded(self, blurred_image: np.ndarray) -> np.ndarray:
+        """
+        Resolve H_y X + X H_x = imagem_borrada sem montar H_x/H_y.
+        
+        H_x e H_y são Toeplitz triangulares inferiores em banda (largura = tamanho
+        do PSF) mais regularização na diagonal. Como H_x é triangular inferior, a
+        coluna j da equação é
+            (H_y + H_x[j, j] I) x_j = b_j - sum_{k>j} H_x[k, j] x_k,
+        e H_x[j, j] é o mesmo para todo j. Logo as colunas são resolvidas da
+        última para a primeira com uma única matriz triangular em banda
+        (LAPACK ?tbtrs), em O(h * psf) por coluna.
+        """
+        h, w = blurred_image.shape
+        col_x = self._estimated_psf[0, :min(self._estimated_psf.shape[1], w)]
+        col_y = self._estimated_psf[:min(self._estimated_psf.shape[0], h), 0]
+        
+        # Armazenamento em banda (triangular inferior): band[k, j] = M[j + k, j]
+        band = np.repeat(col_y[:, None], h, axis=1).astype(np.float64)
+        band[0] += 2 * self.regularization + col_x[0]
+        
+        image = np.asfortranarray(blurred_image, dtype=np.float64)
+        restored = np.zeros((h, w), order='F')
+        tbtrs, = get_lapack_funcs(('tbtrs',), (band,))
+        for j in range(w - 1, -1, -1):
+            k = min(len(col_x) - 1, w - 1 - j)
+            rhs = image[:, j] - restored[:, j + 1:j + 1 + k] @ col_x[1:1 + k]
+            x, info = tbtrs(band, rhs[:, None], uplo='L')
+            if info != 0:
+                raise np.linalg.LinAlgError(f"Sistema triangular singular (info={info})")
+            restored[:, j] = x[:, 0]
+        return restored
+    
+    def _psf_spectrum(self, shape: Tuple[int, int]) -> np.ndarray:
+        """
+        Retorna a FFT real do PSF estimado no formato dado, reaproveitando
+        espectros já calculados para imagens do mesmo tamanho.
+        """
+        if self._psf_spectra_source is not self._estimated_psf:
+            self._psf_spectra = {}
+            self._psf_spectra_source = self._estimated_psf
+        if shape not in self._psf_spectra:
+            self._psf_spectra[shape] = rfft2(self._estimated_psf, s=shape)
+        return self._psf_spectra[shape]
+    
+    def _solve_wiener(self, blurred_image: np.ndarray) -> np.ndarray:
+        """
+        Restaura a imagem no domínio da frequência (filtro de Wiener/Tikhonov):
+            X = conj(H) B / (|H|^2 + regularization)
+        O PSF fica na origem, o mesmo alinhamento causal das matrizes Toeplitz
+        triangulares inferiores. A imagem é estendida pela borda até um tamanho
+        rápido de FFT que comporta o suporte do PSF, reduzindo o efeito da
+        convolução circular.
+        """
+        h, w = blurred_image.shape
+        shape, observed, H = self._wiener_spectra(blurred_image)
+        spectrum = np.conj(H) * observed / (np.abs(H) ** 2 + self.regularization)
+        return irfft2(spectrum, s=shape)[:h, :w]
+    
+    def _wiener_spectra(self, blurred_image: np.ndarray) -> Tuple[Tuple[int, int], np.ndarray, np.ndarray]:
+        """
+        Estende a imagem pela borda e retorna (formato da FFT, espectro da imagem,
+        espectro do PSF) usados pela restauração no domínio da frequência.
+        """
+        h, w = blurred_image.shape
+        psf_h, psf_w = self._estimated_psf.shape
+        shape = (next_fast_len(h + psf_h - 1, real=True), next_fast_len(w + psf_w - 1, real=True))
+        padded = np.pad(blurred_image, ((0, shape[0] - h), (0, shape[1] - w)), mode='edge')
+        return shape, rfft2(padded), self._psf_spectrum(shape)
@@ -0,0 +1,136 @@
+import multiprocessing
+import numpy as np
+from typing import Optional, Tuple
+from .sylvester import sylvester_matrix
+
+AGGREGATIONS = ('median', 'consensus')
+# Pares decompostos por vez: limita a memória das matrizes empilhadas
+CHUNK_SIZE = 8
+
+def _pool_context():
+    """
+    Start method dos processos do pool. Um fork de um processo que já iniciou
+    threads (BLAS, Numba) pode travar, então os processos saem de um servidor
+    limpo com este módulo pré-carregado, ou são criados com spawn onde não há
+    forkserver (a mesma política dos workers de convolucao). O script chamador
+    precisa proteger o ponto de entrada com `if __name__ == '__main__':`.
+    """
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    context = multiprocessing.get_context('forkserver')
+    # Só vale quando o servidor inicia; chamadas seguintes não têm efeito
+    context.set_forkserver_preload([__name__])
+    return context
+
+def _knee_points(singular_values: np.ndarray) -> np.ndarray:
+    """Ponto de "joelho" de cada espectro singular (mesmo critério de _estimate_psf_degree)."""
+    normalized = singular_values / singular_values[:, :1]
+    return np.argmax(np.diff(normalized, axis=-1), axis=-1) + 1
+
+def _nonzero_columns(n: int, max_psf_size: int) -> int:
+    """Colunas não nulas de cada matriz de Sylvester (as últimas max_psf_size são nulas)."""
+    return 2 * (n - max_psf_size)
+
+def _pair_degrees(args: Tuple[np.ndarray, np.ndarray, int]) -> np.ndarray:
+    """
+    Graus estimados (joelho do espectro) de um bloco de pares.
+    Só os valores singulares são calculados: as colunas nulas da matriz de
+    Sylvester contribuem com zeros exatos, então a SVD é feita apenas sobre
+    o bloco não nulo, sem vetores singulares.
+    """
+    first, second, max_psf_size = args
+    S = sylvester_matrix(first, second, max_psf_size)
+    columns = _nonzero_columns(first.shape[-1], max_psf_size)
+    s = np.zeros(S.shape[:-1])
+    s[:, :columns] = np.linalg.svd(S[..., :columns], compute_uv=False)
+    return _knee_points(s)
+
+def _pair_psfs(args: Tuple[np.ndarray, np.ndarray, int, int]) -> np.ndarray:
+    """
+    Linha degree-1 de V^T de cada par do bloco, restrita às degree primeiras
+    colunas. Se o grau cai no bloco não nulo A, o vetor singular vem da
+    decomposição espectral de A^T A, sem calcular U; caso contrário é o vetor
+    canônico da coluna nula correspondente.
+    """
+    first, second, max_psf_size, degree = args
+    columns = _nonzero_columns(first.shape[-1], max_psf_size)
+    psfs = np.zeros((first.shape[0], degree))
+    if degree > columns:
+        psfs[:, degree - 1] = 1.0
+        return psfs
+    A = sylvester_matrix(first, second, max_psf_size)[..., :columns]
+    _, v = np.linalg.eigh(np.swapaxes(A, -1, -2) @ A)
+    # eigh ordena os autovalores em ordem crescente
+    return v[:, :degree, columns - degree]
+
+def _consensus_degree(parts) -> int:
+    """Mediana dos graus detectados em todos os blocos."""
+    return int(np.round(np.median(np.concatenate(list(parts)))))
+
+def _aggregate(psfs: np.ndarray, method: str) -> np.ndarray:
+    """
+    Combina as estimativas (K, grau) de forma robusta.
+    'median': mediana elemento a elemento
+    'consensus': média das estimativas mais próximas da mediana (metade inferior
+                 das distâncias), descartando pares discordantes
+    """
+    median = np.median(psfs, axis=0)
+    if method == 'median' or len(psfs) < 3:
+        return median
+    distances = np.linalg.norm(psfs - median, axis=1)
+    inliers = distances <= np.median(distances)
+    return psfs[inliers].mean(axis=0)
+
+def select_line_pairs(image: np.ndarray, axis: int, num_pairs: int,
+                      spacing: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Seleciona num_pairs pares de linhas (axis=0) ou colunas (axis=1) vizinhas,
+    distribuídos uniformemente pela imagem.
+    Retorna dois arrays (K, n) com o primeiro e o segundo vetor de cada par.
+    """
+    lines = image if axis == 0 else image.T
+    available = lines.shape[0] - spacing
+    if available < 1:
+        raise ValueError(f"A imagem não tem linhas suficientes para pares com espaçamento {spacing}")
+    starts = np.unique(np.linspace(0, available - 1, min(num_pairs, available)).astype(int))
+    return lines[starts], lines[starts + spacing]
+
+def estimate_1d_psf_batch(first: np.ndarray, second: np.ndarray, max_psf_size: int,
+                          aggregate: str = 'median', workers: int = 1,
+                          chunk_size: Optional[int] = None) -> np.ndarray:
+    """
+    Estima o PSF 1D a partir de K pares de vetores com SVD em lote.
+    1. Monta as matrizes de Sylvester em blocos de chunk_size pares (padrão
+       CHUNK_SIZE), distribuídos por um pool de processos quando workers > 1
+       (ver _pool_context: o script precisa de `if __name__ == '__main__':`).
+    2. Calcula, em lote, apenas os valores singulares de cada bloco.
+    3. Usa a mediana dos graus detectados como grau de consenso.
+    4. Extrai o vetor singular desse grau de cada par, normaliza e combina
+       de forma robusta.
+    """
+    if aggregate not in AGGREGATIONS:
+        raise ValueError(f"Agregação desconhecida '{aggregate}'. Use uma de {AGGREGATIONS}")
+    first = np.atleast_2d(np.asarray(first, dtype=np.float64))
+    second = np.atleast_2d(np.asarray(second, dtype=np.float64))
+    num_pairs = first.shape[0]
+
+    chunk_size = chunk_size or min(CHUNK_SIZE, -(-num_pairs // max(workers, 1)))
+    chunks = [(first[i:i + chunk_size], second[i:i + chunk_size], max_psf_size)
+              for i in range(0, num_pairs, chunk_size)]
+    if workers > 1 and len(chunks) > 1:
+        with _pool_context().Pool(min(workers, len(chunks))) as pool:
+            degree = _consensus_degree(pool.map(_pair_degrees, chunks))
+            psfs = np.concatenate(pool.map(_pair_psfs, [c + (degree,) for c in chunks]))
+    else:
+        degree = _consensus_degree(map(_pair_degrees, chunks))
+        psfs = np.concatenate([_pair_psfs(c + (degree,)) for c in chunks])
+
+    sums = psfs.sum(axis=1, keepdims=True)
+    # Pares cujo vetor soma zero não definem um PSF normalizável
+    valid = np.abs(sums[:, 0]) > np.finfo(float).eps
+    if not np.any(valid):
+        return np.ones(degree) / degree
+    psfs = psfs[valid] / sums[valid]
+
+    psf = _aggregate(psfs, aggregate)
+    return psf / np.sum(psf)
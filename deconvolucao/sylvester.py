@@ -0,0 +1,92 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import convolve, correlate
+from scipy.sparse.linalg import LinearOperator
+
+def _shifted_columns(vectors: np.ndarray, num_shifts: int, size: int) -> np.ndarray:
+    """
+    Retorna, como visão com strides (sem cópia nem laços em Python), o bloco
+    (K, size, num_shifts) cuja coluna i contém o vetor de cada par deslocado de
+    i posições para baixo.
+    """
+    k, n = vectors.shape
+    if num_shifts < 1:
+        return np.zeros((k, size, 0))
+    # padded[r + num_shifts - 1 - i] = vectors[r - i] dentro do suporte, zero fora
+    padded = np.zeros((k, size + num_shifts - 1))
+    padded[:, num_shifts - 1:num_shifts - 1 + n] = vectors
+    return sliding_window_view(padded, num_shifts, axis=-1)[:, :size, ::-1]
+
+def sylvester_matrix(first: np.ndarray, second: np.ndarray, degree: int) -> np.ndarray:
+    """
+    Constrói a matriz de Sylvester de dois vetores (linhas ou colunas da imagem),
+    no layout usado pela estimativa do PSF: a coluna i do bloco esquerdo
+    (direito) contém o primeiro (segundo) vetor deslocado de i posições, para
+    i < n-degree, e as últimas degree colunas ficam nulas.
+    first, second: vetores (n,) ou pilhas (K, n) de pares
+    degree: grau estimado do PSF
+    Retorna (2n-degree, 2n-degree), ou (K, 2n-degree, 2n-degree) para pilhas.
+    """
+    first = np.asarray(first, dtype=np.float64)
+    second = np.asarray(second, dtype=np.float64)
+    single = first.ndim == 1
+    first = np.atleast_2d(first)
+    second = np.atleast_2d(second)
+    n = first.shape[-1]
+    size = 2 * n - degree
+    S = np.zeros((first.shape[0], size, size))
+    S[..., :n - degree] = _shifted_columns(first, n - degree, size)
+    S[..., n - degree:2 * (n - degree)] = _shifted_columns(second, n - degree, size)
+    return S[0] if single else S
+
+def resultant_matrix(f: np.ndarray, g: np.ndarray) -> np.ndarray:
+    """
+    Constrói a matriz resultante de Sylvester clássica dos polinômios f (grau m)
+    e g (grau n), de tamanho (m+n, m+n): as n primeiras linhas contêm os
+    coeficientes de f deslocados e as m seguintes os de g.
+    f, g: vetores de coeficientes ou pilhas (K, m+1) e (K, n+1)
+    """
+    f = np.asarray(f, dtype=np.float64)
+    g = np.asarray(g, dtype=np.float64)
+    single = f.ndim == 1
+    f = np.atleast_2d(f)
+    g = np.atleast_2d(g)
+    m = f.shape[-1] - 1
+    n = g.shape[-1] - 1
+    size = m + n
+    columns = np.concatenate([_shifted_columns(f, n, size), _shifted_columns(g, m, size)], axis=-1)
+    S = np.swapaxes(columns, -1, -2)
+    return S[0] if single else S
+
+class SylvesterOperator(LinearOperator):
+    """
+    Forma implícita da matriz de sylvester_matrix(first, second, degree).
+    Os produtos S v e S^T u são convoluções/correlações com os dois vetores,
+    sem materializar a matriz (O(n) de memória), para uso com resolvedores
+    iterativos (svds, LOBPCG, lsqr).
+    """
+
+    def __init__(self, first: np.ndarray, second: np.ndarray, degree: int):
+        self.first = np.asarray(first, dtype=np.float64)
+        self.second = np.asarray(second, dtype=np.float64)
+        self.degree = degree
+        n = self.first.shape[-1]
+        self.num_shifts = n - degree
+        size = 2 * n - degree
+        super().__init__(dtype=np.float64, shape=(size, size))
+
+    def _matvec(self, v: np.ndarray) -> np.ndarray:
+        v = np.ravel(v)
+        k = self.num_shifts
+        out = np.zeros(self.shape[0])
+        # Convolução completa tem 2n-degree-1 termos; a última linha é nula
+        out[:-1] = convolve(self.first, v[:k]) + convolve(self.second, v[k:2 * k])
+        return out
+
+    def _rmatvec(self, u: np.ndarray) -> np.ndarray:
+        u = np.ravel(u)
+        k = self.num_shifts
+        out = np.zeros(self.shape[1])
+        out[:k] = correlate(u, self.first, mode='valid')[:k]
+        out[k:2 * k] = correlate(u, self.second, mode='valid')[:k]
+        return out
@@ -2,7 +2,7 @@ import os
 import time
 import argparse
 from pathlib import Path
-from simulation.adi_simulation import ADIHeatSimulation
+from convolucao.adi_heat_simulation import ADIHeatSimulation
 from image_processing import ImageProcessor
 from sylvester_resultant.applications import ImageProcessingApplications
 
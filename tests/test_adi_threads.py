@@ -0,0 +1,34 @@
+import gc
+
+import numpy as np
+
+from convolucao.adi_heat_simulation import ADIHeatSimulation
+
+
+def _frame(size=160, seed=0):
+    return np.random.default_rng(seed).random((size, size))
+
+
+def test_threaded_matches_single_thread():
+    matrix = _frame()
+    expected = ADIHeatSimulation(0.1).simulate(matrix, 5)
+    with ADIHeatSimulation(0.1, num_threads=3) as simulation:
+        result = simulation.simulate(matrix, 5)
+        threads = list(simulation._executor._threads)
+    assert threads
+    np.testing.assert_array_equal(result, expected)
+    assert simulation._executor is None
+    for thread in threads:
+        thread.join(timeout=10)
+        assert not thread.is_alive()
+
+
+def test_pool_released_without_close():
+    simulation = ADIHeatSimulation(0.1, num_threads=2)
+    simulation.simulate(_frame(), 2)
+    threads = list(simulation._executor._threads)
+    del simulation
+    gc.collect()
+    for thread in threads:
+        thread.join(timeout=10)
+        assert not thread.is_alive()
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from convolucao.finite_diff_simulation import FiniteDiffHeatSimulation
+
+
+@pytest.fixture
+def matrix():
+    return np.random.default_rng(0).random((70, 53))
+
+
+def test_default_passes_match_simulate(matrix):
+    simulation = FiniteDiffHeatSimulation(0.1)
+    out = np.empty_like(matrix)
+    simulation.simulate_out_of_core(matrix, 40, out, tile_size=16)
+    np.testing.assert_array_equal(out, simulation.simulate(matrix, 40))
+
+
+def test_halo_wider_than_tile_is_rejected(matrix):
+    simulation = FiniteDiffHeatSimulation(0.1)
+    with pytest.raises(ValueError, match="steps_per_pass"):
+        simulation.simulate_out_of_core(matrix, 40, np.empty_like(matrix), tile_size=16, steps_per_pass=17)
@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+from deconvolucao.blind_deconv import BlindDeconvolution
+from deconvolucao.psf_estimation import estimate_1d_psf_batch
+
+
+def test_pool_matches_serial():
+    rng = np.random.default_rng(0)
+    first, second = rng.random((20, 64)), rng.random((20, 64))
+    expected = estimate_1d_psf_batch(first, second, 1)
+    result = estimate_1d_psf_batch(first, second, 1, workers=2, chunk_size=4)
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_pyramid_with_several_pairs_is_rejected():
+    with pytest.raises(ValueError, match="pyramid_levels"):
+        BlindDeconvolution(num_pairs=4, pyramid_levels=1)
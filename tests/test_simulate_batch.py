@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from convolucao.finite_diff_simulation import FiniteDiffHeatSimulation
+
+
+@pytest.fixture
+def stack():
+    return np.random.default_rng(0).random((12, 10, 3))
+
+
+def test_per_channel_counts_match_simulate(stack):
+    simulation = FiniteDiffHeatSimulation(0.1)
+    result = simulation.simulate_batch(stack, np.array([1, 2, 3]))
+    for channel, n in enumerate([1, 2, 3]):
+        np.testing.assert_allclose(result[..., channel], simulation.simulate(stack[..., channel], n))
+
+
+@pytest.mark.parametrize("counts", [[1.7, 2, 3], 2.0])
+def test_non_integer_counts_are_rejected(stack, counts):
+    with pytest.raises(ValueError, match="integers"):
+        FiniteDiffHeatSimulation(0.1).simulate_batch(stack, counts)
@@ -0,0 +1,64 @@
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from convolucao.conv_simulation import conv_simulation
+from convolucao.finite_diff_simulation import FiniteDiffHeatSimulation, njit
+from convolucao.heat_simulation import NeighborAveragingHeatSimulation, funcao_calor_otim_matrix
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def matrix():
+    return np.random.default_rng(0).random((97, 80))
+
+
+@pytest.mark.parametrize('workers', [2, 3])
+def test_finite_diff_parallel_matches_serial(matrix, workers):
+    simulation = FiniteDiffHeatSimulation(0.2)
+    expected = simulation.simulate(matrix, 25)
+    assert np.array_equal(simulation.simulate_parallel(matrix, 25, workers=workers), expected)
+
+
+@pytest.mark.parametrize('workers', [2, 3])
+def test_conv_simulation_parallel_matches_serial(matrix, workers):
+    expected = conv_simulation(matrix, 25, 0.2, method='stencil')
+    result = conv_simulation(matrix, 25, 0.2, method='stencil', workers=workers)
+    assert np.array_equal(result, expected)
+
+
+@pytest.mark.parametrize('workers', [2, 3])
+def test_neighbor_averaging_parallel_matches_serial(matrix, workers):
+    expected = funcao_calor_otim_matrix(matrix, 25, 0.7)
+    assert np.array_equal(funcao_calor_otim_matrix(matrix, 25, 0.7, workers=workers), expected)
+    simulation = NeighborAveragingHeatSimulation(0.7)
+    assert np.array_equal(simulation.simulate_parallel(matrix, 25, workers=workers),
+                          simulation.simulate(matrix, 25))
+
+
+@pytest.mark.parametrize('use_jit', [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(njit is None, reason="numba is not installed")),
+])
+def test_simulate_then_simulate_parallel_in_same_process(use_jit):
+    # Forking after the parallel Numba kernel had run used to hang the parent at exit
+    script = textwrap.dedent(f"""
+        import numpy as np
+        from convolucao.finite_diff_simulation import FiniteDiffHeatSimulation
+
+        if __name__ == '__main__':
+            matrix = np.random.default_rng(0).random((96, 80))
+            simulation = FiniteDiffHeatSimulation(0.2, use_jit={use_jit})
+            serial = simulation.simulate(matrix, 30)
+            parallel = simulation.simulate_parallel(matrix, 30, workers=3)
+            print(np.array_equal(serial, parallel))
+    """)
+    completed = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True,
+                               text=True, timeout=300)
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip() == 'True'